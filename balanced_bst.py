@@ -2,7 +2,10 @@
 
 # Povolené knihovny: typing, math, fractions
 
-from typing import Optional, TextIO, List
+from array import array
+from fractions import Fraction
+from math import inf
+from typing import Iterable, Iterator, Optional, TextIO, List, Tuple, Union
 
 # IB002 Domácí úloha 9
 #
@@ -187,6 +190,14 @@ def is_node_balanced(node: Optional[Node], m_n: float) -> bool:
     return left_balanced and right_balanced
 
 
+def is_node_k_balanced(node: Node, numerator: int, denominator: int) -> bool:
+    # totéž co is_node_balanced pro k = numerator / denominator,
+    # ale v přesné celočíselné aritmetice
+    limit = numerator * node.size
+    return (node.left is None or denominator * node.left.size <= limit) and \
+        (node.right is None or denominator * node.right.size <= limit)
+
+
 # Část 2.
 # Implementujte funkci pro vkládání nového klíče do stromu (pokud už klíč
 # ve stromě existuje, nic se nevloží). Pokud se vložením klíče poruší
@@ -264,11 +275,16 @@ def insert(tree: BSTree, key: int) -> Optional[Node]:
 
 
 def find_3_5_disbalance(node: Optional[Node]) -> Optional[Node]:
+    return find_disbalance(node, 3, 5)
+
+
+def find_disbalance(node: Optional[Node],
+                    numerator: int, denominator: int) -> Optional[Node]:
     disbalanced_node = None
 
     while node is not None:
         node.size += 1
-        if not is_node_balanced(node, 3/5):
+        if not is_node_k_balanced(node, numerator, denominator):
             disbalanced_node = node
         node = node.parent
 
@@ -396,6 +412,1025 @@ def inorder(node: Optional[Node], lst: List[Node]) -> None:
         inorder(node.right, lst)
 
 
+# Rozšíření: hromadné vytvoření stromu, split a join.
+# Všechny funkce níže pracují se stromy se správnými atributy ‹size›
+# a ‹parent›. Funkce split a join vstupní stromy spotřebují (jejich uzly
+# přesunou do výsledku a kořeny vstupních stromů nastaví na ‹None›).
+# Výsledky split a join nejsou obecně 3/5-vyvážené, ale vyvážené podle
+# váhy (viz níže), díky čemuž stačí vyváženost obnovovat rotacemi podél
+# jedné cesty. Pokud je potřeba 3/5-vyvážený strom, stačí na výsledek
+# zavolat rebalance (v čase O(n)).
+
+def subtree_size(node: Optional[Node]) -> int:
+    return 0 if node is None else node.size
+
+
+def build_from_sorted(keys: Iterable[int]) -> BSTree:
+    """
+    vstup: ‹keys› – ostře rostoucí posloupnost klíčů
+    výstup: nový 1/2-vyvážený binární vyhledávací strom obsahující právě
+            klíče z ‹keys› se správnými atributy ‹size› a ‹parent›
+            Pokud posloupnost není ostře rostoucí, funkce vyhodí ValueError.
+    časová složitost: O(n), kde ‹n› je počet klíčů
+    """
+    nodes: List[Node] = []
+    for key in keys:
+        if nodes and nodes[-1].key >= key:
+            raise ValueError("keys must be strictly increasing")
+        nodes.append(Node(key))
+
+    tree = BSTree()
+    rebalance_rec(tree, 0, len(nodes), nodes, None, None)
+    return tree
+
+
+def split(tree: BSTree, key: int) -> Tuple[BSTree, BSTree]:
+    """
+    vstup: ‹tree› – binární vyhledávací strom vyvážený podle váhy
+                    (např. 3/5-vyvážený) se správnými atributy ‹size›
+           ‹key› – celé číslo
+    výstup: dvojice stromů (‹lower›, ‹upper›), kde ‹lower› obsahuje klíče
+            menší než ‹key› a ‹upper› klíče větší nebo rovné ‹key›;
+            oba stromy jsou vyvážené podle váhy se správnými atributy
+            ‹size› a ‹parent›. Strom ‹tree› zůstane prázdný.
+    časová složitost: O(log n), kde ‹n› je počet uzlů stromu ‹tree›
+    """
+    path: List[Node] = []
+    node = tree.root
+    while node is not None:
+        path.append(node)
+        node = node.right if node.key < key else node.left
+    tree.root = None
+
+    # Cestu skládáme zdola: uzel menší než ‹key› spojíme s jeho levým
+    # podstromem a dosud složenou dolní částí, větší uzel symetricky.
+    lower_root: Optional[Node] = None
+    upper_root: Optional[Node] = None
+    for node in reversed(path):
+        if node.key < key:
+            lower_root = join_nodes(node.left, node, lower_root)
+        else:
+            upper_root = join_nodes(upper_root, node, node.right)
+    return BSTree(lower_root), BSTree(upper_root)
+
+
+def join(lower: BSTree, upper: BSTree) -> BSTree:
+    """
+    vstup: ‹lower›, ‹upper› – binární vyhledávací stromy vyvážené podle
+                    váhy (např. 3/5-vyvážené) se správnými atributy
+                    ‹size›, přičemž všechny klíče v ‹lower› jsou menší než
+                    všechny klíče v ‹upper›
+    výstup: strom vyvážený podle váhy obsahující klíče obou stromů
+            se správnými atributy ‹size› a ‹parent›; stromy ‹lower›
+            a ‹upper› zůstanou prázdné
+    časová složitost: O(log n), kde ‹n› je počet uzlů obou stromů
+    """
+    left_root, right_root = lower.root, upper.root
+    lower.root = upper.root = None
+    if left_root is None or right_root is None:
+        root = right_root if left_root is None else left_root
+        return BSTree(root)
+
+    # jako spojovací uzel použijeme minimum z ‹upper›; po jeho odebrání
+    # složíme levou páteř ‹upper› zdola stejně jako ve split
+    path: List[Node] = []
+    node = right_root
+    while node is not None:
+        path.append(node)
+        node = node.left
+    pivot = path.pop()
+    rest = pivot.right
+    for node in reversed(path):
+        rest = join_nodes(rest, node, node.right)
+    return BSTree(join_nodes(left_root, pivot, rest))
+
+
+def join_nodes(left: Optional[Node], pivot: Node,
+               right: Optional[Node]) -> Node:
+    """
+    vstup: ‹left›, ‹right› – kořeny podstromů vyvážených podle váhy (nebo
+                    ‹None›) se správnými atributy ‹size›
+           ‹pivot› – uzel s klíčem větším než klíče v ‹left› a menším než
+                    klíče v ‹right› (jeho potomci se přepíší)
+    výstup: kořen stromu vyváženého podle váhy z uzlů ‹left›, ‹pivot›
+            a ‹right›, jeho atribut ‹parent› je ‹None›
+    časová složitost: O(|h(left) - h(right)| + 1)
+
+    Pivot se zavěsí na páteř těžšího stromu do místa, kde je podstrom
+    srovnatelně těžký jako lehčí strom, a na cestě zpět se vyváženost
+    obnoví jednoduchou nebo dvojitou rotací.
+    """
+    path: List[Node] = []
+    if subtree_size(left) >= subtree_size(right):
+        node = left
+        while not is_weight_like(node, right):
+            path.append(node)
+            node = node.right  # type: ignore
+        child = attach_children(pivot, node, right)
+        for node in reversed(path):
+            child = join_right_step(node, child)
+    else:
+        node = right
+        while not is_weight_like(left, node):
+            path.append(node)
+            node = node.left  # type: ignore
+        child = attach_children(pivot, left, node)
+        for node in reversed(path):
+            child = join_left_step(node, child)
+    child.parent = None
+    return child
+
+
+# Váhou podstromu rozumíme jeho velikost zvětšenou o 1. Strom je vyvážený
+# podle váhy, pokud váha žádného potomka žádného uzlu nepřesahuje
+# trojnásobek váhy jeho sourozence. Každý 3/5-vyvážený strom je vyvážený
+# podle váhy a každý strom vyvážený podle váhy je 3/4-vyvážený, má tedy
+# logaritmickou výšku. Pro tento poměr (na rozdíl od poměru odpovídajícího
+# 3/5-vyváženosti) vyváženost po spojení vždy obnoví rotace.
+
+WEIGHT_RATIO = 3
+
+
+def weight(node: Optional[Node]) -> int:
+    return subtree_size(node) + 1
+
+
+def is_weight_like(first: Optional[Node], second: Optional[Node]) -> bool:
+    # mohou být ‹first› a ‹second› sourozenci ve stromě vyváženém podle váhy?
+    return are_weights_like(weight(first), weight(second))
+
+
+def are_weights_like(first: int, second: int) -> bool:
+    return first <= WEIGHT_RATIO * second and second <= WEIGHT_RATIO * first
+
+
+def attach_children(node: Node, left: Optional[Node],
+                    right: Optional[Node]) -> Node:
+    node.left, node.right = left, right
+    if left is not None:
+        left.parent = node
+    if right is not None:
+        right.parent = node
+    node.size = subtree_size(left) + subtree_size(right) + 1
+    return node
+
+
+def join_right_step(node: Node, child: Node) -> Node:
+    # ‹child› je nový pravý podstrom uzlu ‹node›, který může být těžší,
+    # než vyváženost dovoluje; vrátí kořen vyváženého podstromu
+    left = node.left
+    if is_weight_like(left, child):
+        return attach_children(node, left, child)
+    inner, outer = child.left, child.right
+    if is_weight_like(left, inner) and \
+            are_weights_like(weight(left) + weight(inner), weight(outer)):
+        # jednoduchá rotace doleva
+        return attach_children(child, attach_children(node, left, inner),
+                               outer)
+    # dvojitá rotace
+    assert inner is not None
+    middle_left, middle_right = inner.left, inner.right
+    return attach_children(inner,
+                           attach_children(node, left, middle_left),
+                           attach_children(child, middle_right, outer))
+
+
+def join_left_step(node: Node, child: Node) -> Node:
+    # zrcadlově k join_right_step pro nový levý podstrom ‹child›
+    right = node.right
+    if is_weight_like(child, right):
+        return attach_children(node, child, right)
+    inner, outer = child.right, child.left
+    if is_weight_like(inner, right) and \
+            are_weights_like(weight(inner) + weight(right), weight(outer)):
+        return attach_children(child, outer,
+                               attach_children(node, inner, right))
+    assert inner is not None
+    middle_left, middle_right = inner.left, inner.right
+    return attach_children(inner,
+                           attach_children(child, outer, middle_left),
+                           attach_children(node, middle_right, right))
+
+
+# Rozšíření: pořadové statistiky.
+
+def select(tree: BSTree, index: int) -> Optional[Node]:
+    """
+    vstup: ‹tree› – binární vyhledávací strom se správnými atributy ‹size›
+           ‹index› – pořadí hledaného klíče (od nuly)
+    výstup: uzel s ‹index›-tým nejmenším klíčem nebo ‹None›, pokud strom
+            tolik uzlů nemá
+    časová složitost: O(h), kde ‹h› je výška stromu
+    """
+    node = tree.root
+    while node is not None:
+        left_size = subtree_size(node.left)
+        if index < left_size:
+            node = node.left
+        elif index == left_size:
+            return node
+        else:
+            index -= left_size + 1
+            node = node.right
+    return None
+
+
+def rank(tree: BSTree, key: int) -> int:
+    """
+    vstup: ‹tree› – binární vyhledávací strom se správnými atributy ‹size›
+           ‹key› – celé číslo
+    výstup: počet klíčů ve stromě, které jsou menší než ‹key›
+    časová složitost: O(h), kde ‹h› je výška stromu
+    """
+    result = 0
+    node = tree.root
+    while node is not None:
+        if node.key < key:
+            result += subtree_size(node.left) + 1
+            node = node.right
+        else:
+            node = node.left
+    return result
+
+
+# Rozšíření: kontrola všech vlastností stromu jedním průchodem.
+
+class Violation:
+    """Třída Violation popisuje první nalezené porušení vlastností stromu.
+
+    Atributy:
+        kind    druh porušení: "order" (uspořádání klíčů), "size" (atribut
+                ‹size›), "parent" (atribut ‹parent›) nebo "balance"
+                (k-vyváženost)
+        node    uzel, ve kterém bylo porušení zjištěno
+    """
+    __slots__ = "kind", "node"
+
+    def __init__(self, kind: str, node: Node):
+        self.kind = kind
+        self.node = node
+
+    def __repr__(self) -> str:
+        return f"Violation({self.kind!r}, key={self.node.key})"
+
+
+def balance_fraction(balance: Union[float, Fraction]) -> Fraction:
+    # k zadané jako float (např. 3/5) převedeme na nejbližší jednoduchý
+    # zlomek; přesná hodnota 0.6 je o něco menší než 3/5
+    if isinstance(balance, (int, Fraction)):
+        return Fraction(balance)
+    return Fraction(balance).limit_denominator()
+
+
+def validate(tree: BSTree, balance: Union[float, Fraction] = Fraction(3, 5)) \
+        -> Optional[Violation]:
+    """
+    vstup: ‹tree› – binární vyhledávací strom (atributy ‹size› a ‹parent›
+                    nemusí být správně)
+           ‹balance› – číslo k mezi 1/2 a 1 (včetně), Fraction nebo float
+    výstup: ‹None›, pokud je strom binárním vyhledávacím stromem se
+            správnými atributy ‹size› a ‹parent› a je ‹balance›-vyvážený;
+            jinak objekt Violation popisující první nalezené porušení
+            Funkce nemodifikuje zadaný strom.
+    časová složitost: O(n), kde ‹n› je počet uzlů stromu
+    extra prostorová složitost: O(h), kde ‹h› je výška stromu
+        (Průchod je iterativní, nehrozí tedy přetečení zásobníku rekurze
+         ani u hlubokých stromů.)
+    """
+    if tree is None or tree.root is None:
+        return None
+    if tree.root.parent is not None:
+        return Violation("parent", tree.root)
+
+    balance = balance_fraction(balance)
+    numerator, denominator = balance.numerator, balance.denominator
+    # Stačí lokální kontroly: platí-li v každém uzlu size = 1 + velikosti
+    # potomků, jsou všechny atributy ‹size› správné; uspořádání ověříme
+    # porovnáním sousedních klíčů v iterativním průchodu inorder.
+    stack: List[Node] = []
+    push, pop = stack.append, stack.pop
+    previous_key = -inf
+    node: Optional[Node] = tree.root
+    while True:
+        while node is not None:
+            left, right = node.left, node.right
+            left_size = right_size = 0
+            if left is not None:
+                if left.parent is not node:
+                    return Violation("parent", left)
+                left_size = left.size
+            if right is not None:
+                if right.parent is not node:
+                    return Violation("parent", right)
+                right_size = right.size
+            size = node.size
+            if left_size + right_size + 1 != size:
+                return Violation("size", node)
+            limit = numerator * size
+            if denominator * left_size > limit or \
+                    denominator * right_size > limit:
+                return Violation("balance", node)
+            push(node)
+            node = left
+
+        if not stack:
+            return None
+        node = pop()
+        if previous_key >= node.key:
+            return Violation("order", node)
+        previous_key = node.key
+        node = node.right
+
+
+def benchmark_validate(count: int = 10 ** 5) -> Tuple[float, float]:
+    """
+    Porovná čas validate s postupným voláním check_size
+    a check_3_5_balanced na 1/2-vyváženém stromě s ‹count› uzly.
+    Vrátí dvojici časů v sekundách (check_*, validate).
+    """
+    from time import perf_counter
+
+    tree = build_from_sorted(range(count))
+    start = perf_counter()
+    assert check_size(tree) and check_3_5_balanced(tree)
+    middle = perf_counter()
+    assert validate(tree) is None
+    end = perf_counter()
+
+    print(f"check_size + check_3_5_balanced: {middle - start:.3f} s, "
+          f"validate: {end - middle:.3f} s")
+    return middle - start, end - middle
+
+
+# Rozšíření: strom s nastavitelnou vyvážeností a statistikami přebudování.
+
+class RebuildStats:
+    """Třída RebuildStats shromažďuje statistiky vkládání do stromu
+    WeightBalancedTree.
+
+    Atributy:
+        inserts        počet skutečně vložených klíčů
+        rebuilds       počet volání rebalance
+        rebuilt_nodes  celkový počet uzlů v přebudovaných podstromech
+        depths         depths[d] je počet klíčů, které byly vloženy
+                       do hloubky ‹d› (kořen má hloubku 0)
+    """
+    __slots__ = "inserts", "rebuilds", "rebuilt_nodes", "depths"
+
+    def __init__(self) -> None:
+        self.inserts = 0
+        self.rebuilds = 0
+        self.rebuilt_nodes = 0
+        self.depths: List[int] = []
+
+    def __repr__(self) -> str:
+        return (f"RebuildStats(inserts={self.inserts}, "
+                f"rebuilds={self.rebuilds}, "
+                f"rebuilt_nodes={self.rebuilt_nodes}, "
+                f"max_depth={len(self.depths) - 1})")
+
+
+class WeightBalancedTree(BSTree):
+    """Třída WeightBalancedTree reprezentuje binární vyhledávací strom,
+    který se po každém vložení udržuje k-vyvážený pro zvolené k.
+
+    Atributy:
+        root     odkaz na kořenový uzel stromu nebo ‹None›
+        balance  číslo k mezi 1/2 a 1 (včetně) typu Fraction
+        stats    statistiky vkládání (objekt typu RebuildStats)
+    """
+    __slots__ = "balance", "stats"
+
+    def __init__(self, balance: Union[float, Fraction] = Fraction(3, 5),
+                 root: Optional[Node] = None):
+        super().__init__(root)
+        balance = balance_fraction(balance)
+        if not Fraction(1, 2) <= balance <= 1:
+            raise ValueError("balance must be between 1/2 and 1")
+        self.balance = balance
+        self.stats = RebuildStats()
+
+
+def weight_balanced_insert(tree: WeightBalancedTree, key: int) -> bool:
+    """
+    vstup: ‹tree› – ‹tree.balance›-vyvážený strom se správnými atributy ‹size›
+           ‹key› – celé číslo
+    výstup: ‹True›, pokud byl klíč vložen, ‹False›, pokud už ve stromě byl.
+            Pokud vložení poruší ‹tree.balance›-vyváženost, funkce přebuduje
+            podstrom nejvyššího nevyváženého uzlu pomocí rebalance.
+            Vyváženost se ověřuje v celočíselné aritmetice.
+            Funkce aktualizuje statistiky ‹tree.stats›.
+    časová složitost: O(h) plus amortizovaná cena přebudování
+    """
+    stats = tree.stats
+    if tree.root is None:
+        tree.root = Node(key)
+        parent = None
+    else:
+        parent = insert_key(tree, key)
+        if parent is None:
+            return False
+
+    depth = 0
+    node = parent
+    while node is not None:
+        depth += 1
+        node = node.parent
+    stats.inserts += 1
+    while len(stats.depths) <= depth:
+        stats.depths.append(0)
+    stats.depths[depth] += 1
+
+    disbalanced = find_disbalance(parent, tree.balance.numerator,
+                                  tree.balance.denominator)
+    if disbalanced is not None:
+        stats.rebuilds += 1
+        stats.rebuilt_nodes += disbalanced.size
+        rebalance(tree, disbalanced)
+    return True
+
+
+# Rozšíření: perzistentní verze stromu.
+# V perzistentním režimu se uzly existujících verzí nikdy nemění: vložení
+# zkopíruje jen uzly na cestě od kořene k novému uzlu (případně přebudovaný
+# podstrom) a vrátí kořen nové verze. Staré verze tak zůstávají čitelné
+# bez zamykání a snímek je pouhý odkaz na kořen. Protože uzly sdílí více
+# verzí, atribut ‹parent› zde nemá smysl a nepoužívá se; ke čtení verzí
+# slouží funkce, které jej nepotřebují (select, rank, inorder_keys).
+
+def persistent_insert(root: Optional[Node], key: int) -> Node:
+    """
+    vstup: ‹root› – kořen 3/5-vyvážené verze stromu nebo ‹None›
+           ‹key› – celé číslo
+    výstup: kořen nové 3/5-vyvážené verze stromu, která navíc obsahuje
+            ‹key›; pokud už klíč ve stromě je, vrátí ‹root›
+            Uzly verze ‹root› se nemění.
+    časová složitost: O(h) plus případné přebudování nejvyššího
+            nevyváženého podstromu v čase O(m)
+    """
+    path: List[Node] = []
+    node = root
+    while node is not None:
+        if node.key == key:
+            return root
+        path.append(node)
+        node = node.left if key < node.key else node.right
+
+    child = Node(key)
+    copies: List[Node] = []
+    for original in reversed(path):
+        copy = Node(original.key, original.left, original.right)
+        copy.size = original.size + 1
+        if key < original.key:
+            copy.left = child
+        else:
+            copy.right = child
+        copies.append(copy)
+        child = copy
+    copies.reverse()
+
+    for i, copy in enumerate(copies):
+        if not is_node_k_balanced(copy, 3, 5):
+            rebuilt = build_from_sorted(inorder_keys(copy)).root
+            if i == 0:
+                return rebuilt
+            # rodič je také kopie, můžeme jej tedy upravit
+            parent = copies[i - 1]
+            if parent.left is copy:
+                parent.left = rebuilt
+            else:
+                parent.right = rebuilt
+            break
+
+    return child
+
+
+def inorder_keys(node: Optional[Node]) -> List[int]:
+    # iterativní inorder, nepoužívá atributy ‹parent›
+    result: List[int] = []
+    stack: List[Node] = []
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        result.append(node.key)
+        node = node.right
+    return result
+
+
+def copy_tree(tree: BSTree) -> BSTree:
+    """
+    vstup: ‹tree› – binární vyhledávací strom
+    výstup: úplná kopie stromu se správnými atributy ‹parent›
+    časová složitost: O(n), kde ‹n› je počet uzlů stromu
+    """
+    result = BSTree()
+    if tree.root is None:
+        return result
+
+    result.root = Node(tree.root.key)
+    result.root.size = tree.root.size
+    stack = [(tree.root, result.root)]
+    while stack:
+        original, copy = stack.pop()
+        for child in original.left, original.right:
+            if child is None:
+                continue
+            child_copy = Node(child.key, parent=copy)
+            child_copy.size = child.size
+            if child is original.left:
+                copy.left = child_copy
+            else:
+                copy.right = child_copy
+            stack.append((child, child_copy))
+    return result
+
+
+def benchmark_snapshots(count: int = 10 ** 5, versions: int = 1000,
+                        seed: int = 0) -> None:
+    """
+    Postaví perzistentní strom s ‹count› klíči, pak ‹versions›-krát vloží
+    klíč a uloží snímek. Vypíše paměť na jednu verzi a porovná cenu snímku
+    (uložení kořene) s úplnou kopií stromu pomocí copy_tree.
+    """
+    import random
+    import tracemalloc
+    from time import perf_counter
+
+    rng = random.Random(seed)
+    keys = rng.sample(range(10 * count), count + versions)
+    root: Optional[Node] = None
+    for key in keys[:count]:
+        root = persistent_insert(root, key)
+
+    # čas měříme bez tracemalloc, který výpočet výrazně zpomaluje
+    base = root
+    start = perf_counter()
+    for key in keys[count:]:
+        root = persistent_insert(root, key)
+    elapsed = perf_counter() - start
+
+    root = base
+    snapshots: List[Optional[Node]] = []
+    tracemalloc.start()
+    for key in keys[count:]:
+        root = persistent_insert(root, key)
+        snapshots.append(root)
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tree = BSTree()
+    for key in keys[:count]:
+        node = insert(tree, key)
+        if node is not None:
+            rebalance(tree, node)
+    copies = min(versions, 10)
+    start = perf_counter()
+    for _ in range(copies):
+        copy_tree(tree)
+    copy_elapsed = (perf_counter() - start) / copies
+    tracemalloc.start()
+    snapshot = copy_tree(tree)
+    copy_used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del snapshot
+
+    print(f"perzistentní verze: {used / versions:.0f} B "
+          f"a {elapsed / versions * 1e6:.1f} µs na verzi (vložení + snímek)")
+    print(f"úplná kopie: {copy_used:.0f} B "
+          f"a {copy_elapsed * 1e6:.1f} µs na snímek")
+
+
+# Rozšíření: průchod a mazání intervalu klíčů.
+
+def iter_range(tree: BSTree, lower: int, upper: int) -> Iterator[int]:
+    """
+    vstup: ‹tree› – binární vyhledávací strom se správnými atributy ‹parent›
+           ‹lower›, ‹upper› – meze intervalu (včetně)
+    výstup: generátor klíčů z intervalu [lower, upper] ve vzestupném pořadí;
+            strom se během procházení nesmí měnit
+    časová složitost: O(h + k), kde ‹k› je počet vrácených klíčů
+    extra prostorová složitost: O(1)
+    """
+    # první uzel s klíčem alespoň ‹lower›
+    node = tree.root
+    first = None
+    while node is not None:
+        if node.key < lower:
+            node = node.right
+        else:
+            first = node
+            node = node.left
+
+    node = first
+    while node is not None and node.key <= upper:
+        yield node.key
+        node = successor(node)
+
+
+def successor(node: Node) -> Optional[Node]:
+    if node.right is not None:
+        node = node.right
+        while node.left is not None:
+            node = node.left
+        return node
+
+    while node.parent is not None and node.parent.right is node:
+        node = node.parent
+    return node.parent
+
+
+def delete_range(tree: BSTree, lower: int, upper: int) -> int:
+    """
+    vstup: ‹tree› – 3/5-vyvážený binární vyhledávací strom
+                    se správnými atributy ‹size› a ‹parent›
+           ‹lower›, ‹upper› – meze intervalu (včetně)
+    výstup: Funkce odstraní ze stromu všechny klíče z intervalu
+            [lower, upper] a vrátí jejich počet. Strom zůstane 3/5-vyvážený
+            se správnými atributy ‹size› a ‹parent›.
+    časová složitost: O(h) bez odstraněných uzlů, které se odpojí
+            po celých podstromech; navíc se jako při vkládání (část 2)
+            může přebudovat nejvyšší nevyvážený uzel na změněných cestách,
+            to se ale stane až po řádově tolika změnách, kolik má jeho
+            podstrom uzlů
+    """
+    if lower > upper:
+        return 0
+
+    # nejvyšší uzel s klíčem v intervalu; všechny mazané klíče jsou v jeho
+    # podstromu
+    ancestors: List[Node] = []
+    fork = tree.root
+    while fork is not None and not lower <= fork.key <= upper:
+        ancestors.append(fork)
+        fork = fork.left if upper < fork.key else fork.right
+    if fork is None:
+        return 0
+
+    # z levého podstromu zůstanou klíče menší než ‹lower› a ty tvoří cestu
+    # po pravých potomcích, z pravého symetricky klíče větší než ‹upper›
+    left_path = cut_range_path(fork.left, lower, True)
+    right_path = cut_range_path(fork.right, upper, False)
+
+    # fork nahradíme největším zbylým uzlem vlevo (konec levé cesty),
+    # případně nejmenším vpravo
+    replacement: Optional[Node] = None
+    if left_path:
+        replacement = left_path.pop()
+        attach_child(left_path[-1] if left_path else None,
+                     replacement.left, False)
+        left_root = left_path[0] if left_path else replacement.left
+        right_root = right_path[0] if right_path else None
+    elif right_path:
+        replacement = right_path.pop()
+        attach_child(right_path[-1] if right_path else None,
+                     replacement.right, True)
+        left_root = None
+        right_root = right_path[0] if right_path else replacement.right
+    for path in left_path, right_path:
+        for node in reversed(path):
+            node.size = subtree_size(node.left) + subtree_size(node.right) + 1
+    if replacement is not None:
+        replacement.left, replacement.right = left_root, right_root
+        for child in left_root, right_root:
+            if child is not None:
+                child.parent = replacement
+        replacement.size = subtree_size(left_root) + \
+            subtree_size(right_root) + 1
+
+    parent = ancestors[-1] if ancestors else None
+    removed = fork.size - subtree_size(replacement)
+    if parent is None:
+        tree.root = replacement
+    elif parent.left is fork:
+        parent.left = replacement
+    else:
+        parent.right = replacement
+    if replacement is not None:
+        replacement.parent = parent
+    for node in ancestors:
+        node.size -= removed
+
+    # Změnily se jen uzly na cestách; přebudování uzlu opraví i všechny
+    # uzly pod ním, procházíme je proto shora.
+    changed = ancestors + ([replacement] if replacement is not None else [])
+    for node in changed + left_path + right_path:
+        if not is_node_k_balanced(node, 3, 5):
+            rebalance(tree, node)
+    return removed
+
+
+def cut_range_path(node: Optional[Node], bound: int,
+                   keep_lower: bool) -> List[Node]:
+    # Odpojí z podstromu ‹node› klíče větší nebo rovné ‹bound› (pokud
+    # ‹keep_lower›), resp. menší nebo rovné ‹bound›. Zbylé uzly na cestě
+    # hledání ‹bound› spojí do cesty po pravých (resp. levých) potomcích
+    # a vrátí ji shora; atributy ‹size› na ní nejsou přepočítané.
+    path: List[Node] = []
+    while node is not None:
+        if (node.key < bound) if keep_lower else (node.key > bound):
+            attach_child(path[-1] if path else None, node, not keep_lower)
+            path.append(node)
+            node = node.right if keep_lower else node.left
+        else:
+            node = node.left if keep_lower else node.right
+    if path:
+        attach_child(path[-1], None, not keep_lower)
+        path[0].parent = None
+    return path
+
+
+def attach_child(parent: Optional[Node], child: Optional[Node],
+                 is_left: bool) -> None:
+    if parent is not None:
+        if is_left:
+            parent.left = child
+        else:
+            parent.right = child
+    if child is not None:
+        child.parent = parent
+
+
+# Rozšíření: strom uložený v polích.
+# Místo objektů typu Node jsou atributy všech uzlů uloženy v paralelních
+# polích (modul array) a uzel je reprezentován indexem do nich. Chybějící
+# potomek nebo rodič se značí hodnotou NIL. Uvolněné indexy se řetězí
+# přes pole ‹right› do seznamu volných míst a při vkládání se použijí znovu.
+# Funkce array_* odpovídají stejnojmenným funkcím pro BSTree.
+
+NIL = -1
+
+
+class ArrayBSTree:
+    """Třída ArrayBSTree reprezentuje binární vyhledávací strom v polích.
+
+    Atributy:
+        keys    klíče uzlů
+        left    indexy levých potomků nebo NIL
+        right   indexy pravých potomků nebo NIL
+                (u volných míst index dalšího volného místa nebo NIL)
+        parent  indexy rodičů nebo NIL
+        size    velikosti podstromů (u volných míst 0)
+        root    index kořene nebo NIL
+        free    index prvního volného místa nebo NIL
+    """
+    __slots__ = "keys", "left", "right", "parent", "size", "root", "free"
+
+    def __init__(self) -> None:
+        self.keys = array('q')
+        self.left = array('l')
+        self.right = array('l')
+        self.parent = array('l')
+        self.size = array('l')
+        self.root = NIL
+        self.free = NIL
+
+
+def array_tree_size(tree: ArrayBSTree) -> int:
+    return 0 if tree.root == NIL else tree.size[tree.root]
+
+
+def array_new_node(tree: ArrayBSTree, key: int, parent: int) -> int:
+    if tree.free == NIL:
+        tree.keys.append(key)
+        tree.left.append(NIL)
+        tree.right.append(NIL)
+        tree.parent.append(parent)
+        tree.size.append(1)
+        return len(tree.keys) - 1
+
+    index = tree.free
+    tree.free = tree.right[index]
+    tree.keys[index] = key
+    tree.left[index] = NIL
+    tree.right[index] = NIL
+    tree.parent[index] = parent
+    tree.size[index] = 1
+    return index
+
+
+def array_free_node(tree: ArrayBSTree, index: int) -> None:
+    tree.left[index] = NIL
+    tree.parent[index] = NIL
+    tree.size[index] = 0
+    tree.right[index] = tree.free
+    tree.free = index
+
+
+def array_insert(tree: ArrayBSTree, key: int) -> int:
+    """
+    vstup: ‹tree› – 3/5-vyvážený strom v polích
+           ‹key› – celé číslo
+    výstup: Funkce vloží klíč do stromu stejně jako insert. Vrátí index
+            nejvyššího uzlu, který přestal být 3/5-vyvážený, nebo NIL.
+    časová složitost: O(h), kde ‹h› je výška stromu
+    """
+    if tree.root == NIL:
+        tree.root = array_new_node(tree, key, NIL)
+        return NIL
+
+    keys, left, right = tree.keys, tree.left, tree.right
+    node = tree.root
+    while True:
+        if keys[node] < key:
+            if right[node] == NIL:
+                right[node] = array_new_node(tree, key, node)
+                break
+            node = right[node]
+        elif keys[node] > key:
+            if left[node] == NIL:
+                left[node] = array_new_node(tree, key, node)
+                break
+            node = left[node]
+        else:
+            return NIL
+
+    size, parent = tree.size, tree.parent
+    disbalanced = NIL
+    while node != NIL:
+        size[node] += 1
+        node_size = size[node]
+        if (left[node] != NIL and 5 * size[left[node]] > 3 * node_size) or \
+                (right[node] != NIL and 5 * size[right[node]] > 3 * node_size):
+            disbalanced = node
+        node = parent[node]
+    return disbalanced
+
+
+def array_delete(tree: ArrayBSTree, key: int) -> bool:
+    """
+    vstup: ‹tree› – strom v polích
+           ‹key› – celé číslo
+    výstup: ‹True›, pokud byl klíč ve stromě a byl odstraněn, ‹False› jinak;
+            uvolněné místo se zařadí do seznamu volných míst
+            (vyváženost se neobnovuje, k tomu slouží array_rebalance)
+    časová složitost: O(h), kde ‹h› je výška stromu
+    """
+    keys, left, right = tree.keys, tree.left, tree.right
+    node = tree.root
+    while node != NIL and keys[node] != key:
+        node = left[node] if key < keys[node] else right[node]
+    if node == NIL:
+        return False
+
+    if left[node] != NIL and right[node] != NIL:
+        # klíč nahradíme následníkem a smažeme uzel následníka
+        succ = right[node]
+        while left[succ] != NIL:
+            succ = left[succ]
+        keys[node] = keys[succ]
+        node = succ
+
+    child = left[node] if left[node] != NIL else right[node]
+    parent = tree.parent[node]
+    if child != NIL:
+        tree.parent[child] = parent
+    if parent == NIL:
+        tree.root = child
+    elif left[parent] == node:
+        left[parent] = child
+    else:
+        right[parent] = child
+    array_free_node(tree, node)
+
+    while parent != NIL:
+        tree.size[parent] -= 1
+        parent = tree.parent[parent]
+    return True
+
+
+def array_rebalance(tree: ArrayBSTree, index: int) -> None:
+    """
+    vstup: ‹tree› – strom v polích se správnými velikostmi
+           ‹index› – index uzlu patřícího do stromu
+    výstup: Funkce přeskládá podstrom uzlu ‹index› tak, aby byl
+            1/2-vyvážený, a zavěsí jej na původní místo (viz rebalance).
+    časová složitost: O(m), kde ‹m› je velikost podstromu uzlu ‹index›
+    """
+    left, right = tree.left, tree.right
+    order: List[int] = []
+    stack: List[int] = []
+    node = index
+    while stack or node != NIL:
+        while node != NIL:
+            stack.append(node)
+            node = left[node]
+        node = stack.pop()
+        order.append(node)
+        node = right[node]
+
+    top_parent = tree.parent[index]
+    if top_parent == NIL:
+        is_left: Optional[bool] = None
+    else:
+        is_left = left[top_parent] == index
+
+    parent, size = tree.parent, tree.size
+    work = [(0, len(order), top_parent, is_left)]
+    while work:
+        lower, upper, up, side = work.pop()
+        if lower == upper:
+            continue
+        middle = (lower + upper) // 2
+        node = order[middle]
+        if side is None:
+            tree.root = node
+        elif side:
+            left[up] = node
+        else:
+            right[up] = node
+        left[node] = NIL
+        right[node] = NIL
+        parent[node] = up
+        size[node] = upper - lower
+        work.append((lower, middle, node, True))
+        work.append((middle + 1, upper, node, False))
+
+
+def array_select(tree: ArrayBSTree, index: int) -> Optional[int]:
+    """
+    vstup: ‹tree› – strom v polích se správnými velikostmi
+           ‹index› – pořadí hledaného klíče (od nuly)
+    výstup: ‹index›-tý nejmenší klíč nebo ‹None› (viz select)
+    časová složitost: O(h), kde ‹h› je výška stromu
+    """
+    left, size = tree.left, tree.size
+    node = tree.root
+    while node != NIL:
+        left_size = 0 if left[node] == NIL else size[left[node]]
+        if index < left_size:
+            node = left[node]
+        elif index == left_size:
+            return tree.keys[node]
+        else:
+            index -= left_size + 1
+            node = tree.right[node]
+    return None
+
+
+def array_rank(tree: ArrayBSTree, key: int) -> int:
+    """
+    vstup: ‹tree› – strom v polích se správnými velikostmi
+           ‹key› – celé číslo
+    výstup: počet klíčů ve stromě, které jsou menší než ‹key› (viz rank)
+    časová složitost: O(h), kde ‹h› je výška stromu
+    """
+    keys, left, size = tree.keys, tree.left, tree.size
+    result = 0
+    node = tree.root
+    while node != NIL:
+        if keys[node] < key:
+            result += 1 if left[node] == NIL else size[left[node]] + 1
+            node = tree.right[node]
+        else:
+            node = left[node]
+    return result
+
+
+def benchmark_memory(count: int = 10 ** 5, seed: int = 0) \
+        -> Tuple[float, float]:
+    """
+    Změří paměť (v bajtech na uzel), kterou zabere strom s ‹count› náhodnými
+    klíči vložený přes insert a rebalance, pro BSTree a pro ArrayBSTree.
+    Vrátí dvojici (BSTree, ArrayBSTree).
+    """
+    import random
+    import tracemalloc
+
+    keys = random.Random(seed).sample(range(10 * count), count)
+    results = []
+    for build in build_object_tree, build_array_tree:
+        tracemalloc.start()
+        tree = build(keys)
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del tree
+        results.append(used / count)
+
+    print(f"BSTree: {results[0]:.1f} B/uzel, "
+          f"ArrayBSTree: {results[1]:.1f} B/uzel")
+    return results[0], results[1]
+
+
+def build_object_tree(keys: Iterable[int]) -> BSTree:
+    tree = BSTree()
+    for key in keys:
+        node = insert(tree, key)
+        if node is not None:
+            rebalance(tree, node)
+    return tree
+
+
+def build_array_tree(keys: Iterable[int]) -> ArrayBSTree:
+    tree = ArrayBSTree()
+    for key in keys:
+        index = array_insert(tree, key)
+        if index != NIL:
+            array_rebalance(tree, index)
+    return tree
+
+
 # Následující funkci můžete použít pro vykreslení stromu při vlastním
 # testování. Použití: draw_tree(strom, název souboru).
 # Výstupem je soubor ve formátu GraphViz.
@@ -3,7 +3,7 @@
 # UČO:
 # Povolené knihovny: math, typing
 
-from typing import Any, Callable, Iterable, List, Tuple, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Optional
 from math import inf
 
 # --- Speciální domácí úkol IB002 2022 ---
@@ -340,6 +340,1283 @@ def delete_node(node: Node, key: int, parent, is_left) -> Optional[Node]:
         delete_node(node.right, key, node, False)
 
 
+# Rozšíření: iterativní varianty
+#
+# is_correct, insert a delete výše jsou rekurzivní a na stromech hlubších
+# než zhruba 1000 úrovní skončí přetečením zásobníku rekurze. Následující
+# varianty dávají stejné výsledky (včetně tvaru stromu), ale používají
+# cykly a explicitní zásobník.
+
+
+def is_correct_iter(tree: HTree) -> bool:
+    """
+    vstup: 'tree' H-strom typu HTree,
+    vystup: stejný jako u is_correct
+    časová složitost: O(n), kde n je počet uzlů stromu 'tree'
+    extra prostorová složitost: O(h), kde h je výška stromu 'tree'
+    """
+    if tree is None or tree.root is None:
+        return True
+
+    # podmienky 2. a 3. platia prave vtedy, ked intervaly v inorder poradi
+    # idu ostro za sebou
+    stack: List[Node] = []
+    previous_high = -inf
+    node = tree.root
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left
+        node = stack.pop()
+        if node.low > node.high or node.low <= previous_high:
+            return False
+        previous_high = node.high
+        node = node.right
+    return True
+
+
+def insert_iter(tree: HTree, key: int) -> None:
+    """
+    vstup: 'tree' korektní H-strom typu HTree
+           'key'  vkládaný klíč
+    vystup: žádný, modifikuje zadaný H-strom stejně jako insert
+    časová složitost: O(h), kde h je výška stromu 'tree'
+    """
+    if tree.root is None:
+        tree.root = Node(key, key, True)
+        return
+
+    node = tree.root
+    while True:
+        if node.low <= key <= node.high:
+            if not node.active:
+                node.low = key
+                node.high = key
+                node.active = True
+            return
+        if key < node.low:
+            if node.left is None:
+                node.left = Node(key, key, True)
+                return
+            node = node.left
+        else:
+            if node.right is None:
+                node.right = Node(key, key, True)
+                return
+            node = node.right
+
+
+def implant_iter(low: int, high: int, node: Node) -> Tuple[Node, bool]:
+    """
+    Iterativní varianta implant se stejnými parametry a návratovou hodnotou.
+    """
+    while True:
+        if low > node.high:
+            if node.right is None:
+                return node, False
+            node = node.right
+        else:
+            if node.left is None:
+                return node, True
+            node = node.left
+
+
+def delete_iter(tree: HTree, key: int) -> None:
+    """
+    vstup: 'tree' H-strom typu HTree
+           'key'  klíč ke smazání
+    vystup: žadný, modifikuje zadaný H-strom stejně jako delete
+    časová složitost: O(h), kde h je výška stromu 'tree'
+    """
+    if tree is None:
+        return
+
+    parent = None
+    is_left = False
+    node = tree.root
+    while node is not None:
+        if node.low <= key <= node.high:
+            if not node.active:
+                return
+            break
+        parent = node
+        is_left = key < node.low
+        node = node.left if is_left else node.right
+    if node is None:
+        return
+
+    new_node = Node(key, key, False)
+    new_node.left = node.left
+    new_node.right = node.right
+    if node.low < key:
+        new_left_node = Node(node.low, key - 1, True)
+        if node.left is None:
+            new_node.left = new_left_node
+        else:
+            insert_node, left = implant_iter(node.low, key - 1, node.left)
+            if left:
+                insert_node.left = new_left_node
+            else:
+                insert_node.right = new_left_node
+    if key < node.high:
+        new_right_node = Node(key + 1, node.high, True)
+        if node.right is None:
+            new_node.right = new_right_node
+        else:
+            insert_node, left = implant_iter(key + 1, node.high, node.right)
+            if left:
+                insert_node.left = new_right_node
+            else:
+                insert_node.right = new_right_node
+
+    if parent is None:
+        tree.root = new_node
+    elif is_left:
+        parent.left = new_node
+    else:
+        parent.right = new_node
+
+
+def benchmark_iterative(count: int = 10 ** 6, shallow: int = 900) -> None:
+    """
+    Porovná rekurzivní a iterativní varianty is_correct, insert, delete
+    a kopírování a převodu stromu na seznam z testů na degenerovaném stromě
+    (řetězci pravých potomků) s ‹count› uzly a s ‹shallow› uzly.
+    """
+    from time import perf_counter
+
+    def chain(size: int) -> HTree:
+        tree = HTree()
+        tree.root = node = Node(0, 0, True)
+        for i in range(1, size):
+            node.right = Node(2 * i, 2 * i, True)
+            node = node.right
+        return tree
+
+    helper = Ib002TestCase([], True)
+    # funkce dostanou strom a pocet jeho uzlov, vkladaju za koniec retazca
+    # a mazu jeho posledny uzol
+    variants = (
+        ("is_correct", lambda t, n: is_correct(t),
+         lambda t, n: is_correct_iter(t)),
+        ("insert", lambda t, n: insert(t, 2 * n + 1),
+         lambda t, n: insert_iter(t, 2 * n + 1)),
+        ("delete", lambda t, n: delete(t, 2 * n - 2),
+         lambda t, n: delete_iter(t, 2 * n - 2)),
+        ("copy_node", lambda t, n: helper.copy_node(t.root),
+         lambda t, n: ib002_copy_node_iter(t.root)),
+        ("to_array", lambda t, n: helper.to_array(t.root),
+         lambda t, n: ib002_to_array_iter(t.root)))
+
+    for size in shallow, count:
+        for name, recursive, iterative in variants:
+            times = []
+            for fun in recursive, iterative:
+                tree = chain(size)
+                start = perf_counter()
+                try:
+                    fun(tree, size)
+                except RecursionError:
+                    times.append("RecursionError")
+                    continue
+                times.append(f"{perf_counter() - start:.4f} s")
+            print(f"{size} uzlů, {name}: rekurzivně {times[0]}, "
+                  f"iterativně {times[1]}")
+
+
+# Rozšíření: vyvážený H-strom
+#
+# Operace insert a delete výše mají složitost O(h) a na sekvenčních vstupech
+# strom degeneruje na seznam. BalancedHTree je H-strom udržovaný jako AVL
+# strom: uzly (intervaly) jsou uspořádány stejně, aktivní a pasivní uzly,
+# rozdělování intervalu při mazání i znovupoužití pasivních intervalů při
+# vkládání fungují stejně jako u insert a delete, jen se po vložení nového
+# uzlu strom vyvažuje rotacemi. Inorder posloupnost intervalů je tedy po
+# stejné posloupnosti operací stejná jako u HTree.
+#
+# Uzly si navíc pamatují výšku a počet prvků reprezentované množiny ve svém
+# podstromu. BalancedHTree je podtřídou HTree, takže funkce is_correct
+# a draw_tree fungují i pro něj.
+
+
+class BalancedNode(Node):
+    """Třída reprezentující uzel vyváženého H-stromu.
+
+    Atributy (navíc oproti Node):
+        height   výška podstromu (list má výšku 1)
+        members  počet celých čísel v aktivních intervalech podstromu
+    """
+    __slots__ = "height", "members"
+
+    def __init__(self, low: int, high: int, active: bool = False) -> None:
+        super().__init__(low, high, active)
+        self.height = 1
+        self.members = high - low + 1 if active else 0
+
+
+class BalancedHTree(HTree):
+    """Třída reprezentující vyvážený H-strom
+
+    Atributy:
+        root    kořen stromu typu BalancedNode nebo None
+    """
+    __slots__ = ()
+
+
+def balanced_height(node: Optional[BalancedNode]) -> int:
+    return 0 if node is None else node.height
+
+
+def balanced_members(node: Optional[BalancedNode]) -> int:
+    return 0 if node is None else node.members
+
+
+def balanced_update(node: BalancedNode) -> None:
+    node.height = 1 + max(balanced_height(node.left),
+                          balanced_height(node.right))
+    node.members = balanced_members(node.left) + \
+        balanced_members(node.right) + \
+        (node.high - node.low + 1 if node.active else 0)
+
+
+def rotate_right(node: BalancedNode) -> BalancedNode:
+    top = node.left
+    node.left = top.right
+    top.right = node
+    balanced_update(node)
+    balanced_update(top)
+    return top
+
+
+def rotate_left(node: BalancedNode) -> BalancedNode:
+    top = node.right
+    node.right = top.left
+    top.left = node
+    balanced_update(node)
+    balanced_update(top)
+    return top
+
+
+def balanced_fix(node: BalancedNode) -> BalancedNode:
+    """
+    :param node: uzol, ktoreho podstromy su AVL stromy s vyskou lisiacou sa najviac o 2
+    :return: koren vyvazeneho podstromu so spravnymi atributmi height a members
+    """
+    balanced_update(node)
+    balance = balanced_height(node.left) - balanced_height(node.right)
+    if balance > 1:
+        if balanced_height(node.left.left) < balanced_height(node.left.right):
+            node.left = rotate_left(node.left)
+        return rotate_right(node)
+    if balance < -1:
+        if balanced_height(node.right.right) < \
+                balanced_height(node.right.left):
+            node.right = rotate_right(node.right)
+        return rotate_left(node)
+    return node
+
+
+def balanced_insert_node(node: Optional[BalancedNode],
+                         new: BalancedNode) -> BalancedNode:
+    """
+    :param node: koren podstromu, do ktoreho vkladam uzol new
+    :param new: uzol s intervalom, ktory sa neprekryva so ziadnym intervalom podstromu
+    :return: koren vyvazeneho podstromu po vlozeni
+    """
+    if node is None:
+        return new
+    if new.high < node.low:
+        node.left = balanced_insert_node(node.left, new)
+    else:
+        node.right = balanced_insert_node(node.right, new)
+    return balanced_fix(node)
+
+
+def balanced_path(tree: BalancedHTree, key: int) -> List[BalancedNode]:
+    """
+    :return: uzly na ceste od korena k uzlu, ktoreho interval obsahuje key
+             (ten je poslednym prvkom), alebo k listu, kde hladanie skoncilo
+    """
+    path = []
+    node = tree.root
+    while node is not None:
+        path.append(node)
+        if key < node.low:
+            node = node.left
+        elif key > node.high:
+            node = node.right
+        else:
+            break
+    return path
+
+
+def balanced_insert(tree: BalancedHTree, key: int) -> None:
+    """
+    vstup: 'tree' korektní vyvážený H-strom typu BalancedHTree
+           'key'  vkládaný klíč
+    vystup: žádný, modifikuje zadaný H-strom stejně jako insert
+            a případně jej vyváží
+    časová složitost: O(log n), kde n je počet uzlů stromu 'tree'
+    """
+    path = balanced_path(tree, key)
+    if path and path[-1].low <= key <= path[-1].high:
+        node = path[-1]
+        if node.active:
+            return
+        node.low = key
+        node.high = key
+        node.active = True
+        for node in reversed(path):
+            balanced_update(node)
+        return
+
+    tree.root = balanced_insert_node(tree.root, BalancedNode(key, key, True))
+
+
+def balanced_delete(tree: BalancedHTree, key: int) -> None:
+    """
+    vstup: 'tree' korektní vyvážený H-strom typu BalancedHTree
+           'key'  klíč ke smazání
+    vystup: žadný, modifikuje zadaný H-strom stejně jako delete; zbylé části
+            intervalu se vloží jako nové uzly a strom se vyváží
+    časová složitost: O(log n), kde n je počet uzlů stromu 'tree'
+    """
+    path = balanced_path(tree, key)
+    if not path:
+        return
+    node = path[-1]
+    if not (node.low <= key <= node.high and node.active):
+        return
+
+    low, high = node.low, node.high
+    node.low = key
+    node.high = key
+    node.active = False
+    for node in reversed(path):
+        balanced_update(node)
+
+    if low < key:
+        tree.root = balanced_insert_node(
+            tree.root, BalancedNode(low, key - 1, True))
+    if key < high:
+        tree.root = balanced_insert_node(
+            tree.root, BalancedNode(key + 1, high, True))
+
+
+def predecessor_node(tree: HTree, key: int) -> Optional[Node]:
+    """
+    :return: uzol s najvacsim intervalom lezacim celym nalavo od key, alebo None
+    """
+    result = None
+    node = tree.root
+    while node is not None:
+        if node.high < key:
+            result = node
+            node = node.right
+        else:
+            node = node.left
+    return result
+
+
+def successor_node(tree: HTree, key: int) -> Optional[Node]:
+    """
+    :return: uzol s najmensim intervalom lezacim celym napravo od key, alebo None
+    """
+    result = None
+    node = tree.root
+    while node is not None:
+        if node.low > key:
+            result = node
+            node = node.left
+        else:
+            node = node.right
+    return result
+
+
+def balanced_remove(node: Optional[BalancedNode],
+                    low: int) -> Optional[BalancedNode]:
+    """
+    :param node: koren podstromu
+    :param low: dolna hranica intervalu uzla, ktory chcem odstranit
+    :return: koren vyvazeneho podstromu po odstraneni
+    """
+    if node is None:
+        return None
+    if low < node.low:
+        node.left = balanced_remove(node.left, low)
+    elif low > node.low:
+        node.right = balanced_remove(node.right, low)
+    elif node.left is None or node.right is None:
+        return node.left if node.left is not None else node.right
+    else:
+        # interval nahradim intervalom nasledovnika a toho odstranim
+        succ = node.right
+        while succ.left is not None:
+            succ = succ.left
+        node.low, node.high, node.active = succ.low, succ.high, succ.active
+        node.right = balanced_remove(node.right, succ.low)
+    return balanced_fix(node)
+
+
+# Vkládání se slučováním intervalů
+#
+# coalescing_insert vkládá stejně jako balanced_insert, ale pokud klíč
+# sousedí s aktivním intervalem (předchůdce končí v key - 1 nebo následník
+# začíná v key + 1), interval se prodlouží, případně se oba sousední
+# intervaly spojí do jednoho. Pasivní interval obsahující klíč se přitom
+# odstraní (při vkládání bez slučování by se také celý nahradil). Po
+# vkládání pouze tímto způsobem je tedy počet aktivních uzlů roven počtu
+# maximálních úseků po sobě jdoucích čísel v množině.
+
+
+def coalescing_insert(tree: BalancedHTree, key: int) -> None:
+    """
+    vstup: 'tree' korektní vyvážený H-strom typu BalancedHTree
+           'key'  vkládaný klíč
+    vystup: žádný, vloží klíč do stromu a sloučí jej se sousedními
+            aktivními intervaly
+    časová složitost: O(log n), kde n je počet uzlů stromu 'tree'
+    """
+    path = balanced_path(tree, key)
+    container = None
+    if path and path[-1].low <= key <= path[-1].high:
+        container = path[-1]
+        if container.active:
+            return
+
+    pred = predecessor_node(tree, key)
+    succ = successor_node(tree, key)
+    join_left = pred is not None and pred.active and pred.high == key - 1
+    join_right = succ is not None and succ.active and succ.low == key + 1
+    if not join_left and not join_right:
+        balanced_insert(tree, key)
+        return
+
+    high = succ.high if join_right else key
+    if container is not None:
+        tree.root = balanced_remove(tree.root, container.low)
+    if join_left and join_right:
+        tree.root = balanced_remove(tree.root, succ.low)
+
+    # po odstraneniach mohli uzly zmenit polohu, preto ich hladam znova
+    path = balanced_path(tree, key - 1 if join_left else key + 1)
+    node = path[-1]
+    if join_left:
+        node.high = high
+    else:
+        node.low = key
+    for node in reversed(path):
+        balanced_update(node)
+
+
+def benchmark_coalescing(count: int = 10 ** 5, seed: int = 0) -> None:
+    """
+    Vloží čísla 0, ..., count - 1 vzestupně a v náhodném pořadí do
+    BalancedHTree pomocí balanced_insert a coalescing_insert a vypíše
+    časy a počty uzlů.
+    """
+    import random
+    from time import perf_counter
+
+    def node_count(node: Optional[Node]) -> int:
+        result = 0
+        stack = [node]
+        while stack:
+            item = stack.pop()
+            if item is not None:
+                result += 1
+                stack.append(item.left)
+                stack.append(item.right)
+        return result
+
+    shuffled = list(range(count))
+    random.Random(seed).shuffle(shuffled)
+    for order_name, keys in ("vzestupně", range(count)), \
+                            ("náhodně", shuffled):
+        for name, fun in ("balanced_insert", balanced_insert), \
+                         ("coalescing_insert", coalescing_insert):
+            tree = BalancedHTree()
+            start = perf_counter()
+            for key in keys:
+                fun(tree, key)
+            elapsed = perf_counter() - start
+            print(f"{order_name}, {name}: {elapsed:.3f} s, "
+                  f"{node_count(tree.root)} uzlů")
+
+
+# Dotazy na reprezentovanou množinu
+#
+# contains a iter_intervals fungují pro libovolný H-strom, count_range
+# využívá atribut members uzlů vyváženého H-stromu.
+
+
+def contains(tree: HTree, key: int) -> bool:
+    """
+    vstup: 'tree' korektní H-strom typu HTree
+           'key'  hledaný klíč
+    vystup: True, pokud 'key' patří do množiny reprezentované stromem 'tree'
+            False jinak
+    časová složitost: O(h), kde h je výška stromu 'tree'
+    """
+    node = tree.root
+    while node is not None:
+        if key < node.low:
+            node = node.left
+        elif key > node.high:
+            node = node.right
+        else:
+            return node.active
+    return False
+
+
+def count_below(tree: BalancedHTree, key: int) -> int:
+    """
+    :return: pocet prvkov mnoziny mensich nez key
+    """
+    result = 0
+    node = tree.root
+    while node is not None:
+        if key <= node.low:
+            node = node.left
+        elif key > node.high:
+            result += balanced_members(node.left) + \
+                (node.high - node.low + 1 if node.active else 0)
+            node = node.right
+        else:
+            result += balanced_members(node.left) + \
+                (key - node.low if node.active else 0)
+            break
+    return result
+
+
+def count_range(tree: BalancedHTree, low: int, high: int) -> int:
+    """
+    vstup: 'tree' korektní vyvážený H-strom typu BalancedHTree
+           'low', 'high' meze intervalu (včetně)
+    vystup: počet prvků reprezentované množiny v intervalu [low, high]
+    časová složitost: O(log n), kde n je počet uzlů stromu 'tree'
+    """
+    if low > high:
+        return 0
+    return count_below(tree, high + 1) - count_below(tree, low)
+
+
+def iter_intervals(tree: HTree, low: int, high: int) \
+        -> Iterator[Tuple[int, int]]:
+    """
+    vstup: 'tree' korektní H-strom typu HTree
+           'low', 'high' meze intervalu (včetně)
+    vystup: generátor vzestupně seřazených aktivních intervalů stromu,
+            které protínají [low, high], oříznutých na [low, high]
+            Strom se během procházení nesmí měnit.
+    časová složitost: O(h + k), kde k je počet navštívených uzlů
+            s intervalem protínajícím [low, high]; u BalancedHTree se navíc
+            přeskakují podstromy bez aktivních uzlů
+    """
+    if low > high:
+        return
+    stack: List[Node] = []
+    node = tree.root
+    while stack or node is not None:
+        while node is not None:
+            if isinstance(node, BalancedNode) and node.members == 0:
+                node = None
+                break
+            stack.append(node)
+            # levy podstrom obsahuje len hodnoty mensie nez node.low
+            node = node.left if low < node.low else None
+        if not stack:
+            return
+        node = stack.pop()
+        if node.low > high:
+            return
+        if node.active and node.high >= low:
+            yield max(node.low, low), min(node.high, high)
+        node = node.right if node.high < high else None
+
+
+def iter_members(tree: HTree, low: int, high: int) -> Iterator[int]:
+    """
+    vstup: 'tree' korektní H-strom typu HTree
+           'low', 'high' meze intervalu (včetně)
+    vystup: generátor vzestupně seřazených prvků reprezentované množiny
+            z intervalu [low, high]
+    """
+    for start, end in iter_intervals(tree, low, high):
+        yield from range(start, end + 1)
+
+
+# Vkládání a mazání intervalů
+#
+# insert_range a delete_range pracují s celými intervaly místo jednotlivých
+# klíčů. Dotčené uzly se odstraní a jejich části ležící mimo zadaný interval
+# se vloží zpět jako nové uzly; cena tedy roste s počtem dotčených uzlů,
+# nikoli s délkou intervalu.
+
+
+def overlapping(tree: HTree, low: int, high: int) -> List[Tuple[int, int, bool]]:
+    """
+    :return: vzostupne zoradene trojice (low, high, active) vsetkych uzlov,
+             ktorych interval zasahuje do [low, high]
+    """
+    result = []
+    stack: List[Node] = []
+    node = tree.root
+    while stack or node is not None:
+        while node is not None:
+            stack.append(node)
+            node = node.left if low < node.low else None
+        node = stack.pop()
+        if node.low > high:
+            break
+        if node.high >= low:
+            result.append((node.low, node.high, node.active))
+        node = node.right if node.high < high else None
+    return result
+
+
+def insert_range(tree: BalancedHTree, low: int, high: int) -> None:
+    """
+    vstup: 'tree' korektní vyvážený H-strom typu BalancedHTree
+           'low', 'high' meze vkládaného intervalu (včetně)
+    vystup: žádný, přidá do množiny všechna čísla z [low, high]
+            Aktivní intervaly, které se s [low, high] překrývají nebo na něj
+            navazují, se s ním sloučí do jednoho aktivního uzlu; pasivní
+            intervaly se ořežou na části mimo [low, high].
+    časová složitost: O((k + 1) log n), kde k je počet dotčených uzlů
+    """
+    if low > high:
+        return
+
+    new_low, new_high = low, high
+    for node_low, node_high, active in overlapping(tree, low - 1, high + 1):
+        if active:
+            new_low = min(new_low, node_low)
+            new_high = max(new_high, node_high)
+        elif node_high < low or node_low > high:
+            continue  # pasivny uzol len susedi s [low, high]
+        tree.root = balanced_remove(tree.root, node_low)
+        if not active and node_low < low:
+            tree.root = balanced_insert_node(
+                tree.root, BalancedNode(node_low, low - 1, False))
+        if not active and node_high > high:
+            tree.root = balanced_insert_node(
+                tree.root, BalancedNode(high + 1, node_high, False))
+
+    tree.root = balanced_insert_node(
+        tree.root, BalancedNode(new_low, new_high, True))
+
+
+def delete_range(tree: BalancedHTree, low: int, high: int) -> None:
+    """
+    vstup: 'tree' korektní vyvážený H-strom typu BalancedHTree
+           'low', 'high' meze mazaného intervalu (včetně)
+    vystup: žádný, odebere z množiny všechna čísla z [low, high]
+            Části dotčených uzlů mimo [low, high] zůstanou ve stromě se
+            stejnou aktivitou a na místě [low, high] vznikne pasivní uzel
+            (obdobně jako při delete).
+    časová složitost: O((k + 1) log n), kde k je počet dotčených uzlů
+    """
+    if low > high:
+        return
+
+    affected = overlapping(tree, low, high)
+    for node_low, node_high, active in affected:
+        tree.root = balanced_remove(tree.root, node_low)
+        if node_low < low:
+            tree.root = balanced_insert_node(
+                tree.root, BalancedNode(node_low, low - 1, active))
+        if node_high > high:
+            tree.root = balanced_insert_node(
+                tree.root, BalancedNode(high + 1, node_high, active))
+
+    if affected:
+        tree.root = balanced_insert_node(
+            tree.root, BalancedNode(low, high, False))
+
+
+# Množinové operace
+#
+# Operace procházejí aktivní intervaly obou stromů vzestupně (lineárně
+# v počtu intervalů) a výsledek postaví rovnou jako vyvážený strom pomocí
+# build_balanced. Vstupem mohou být libovolné H-stromy, vstupní stromy se
+# nemění. Výsledek obsahuje jen aktivní, maximálně sloučené intervaly.
+
+
+def build_balanced(intervals: List[Tuple[int, int, bool]]) -> BalancedHTree:
+    """
+    vstup: 'intervals' vzestupně seřazené disjunktní trojice (low, high, active)
+    vystup: vyvážený H-strom typu BalancedHTree, jehož inorder posloupnost
+            intervalů je právě 'intervals'
+    časová složitost: O(n), kde n je počet intervalů
+    """
+    tree = BalancedHTree()
+    tree.root = build_nodes(intervals, 0, len(intervals), True)
+    return tree
+
+
+def build_nodes(intervals: List[Tuple[int, int, bool]], lower: int,
+                upper: int, balanced: bool) -> Optional[Node]:
+    """
+    :param intervals: vzostupne zoradene trojice (low, high, active)
+    :param lower, upper: stavia sa uzly z intervals[lower:upper]
+    :param balanced: True ak sa maju vytvorit uzly typu BalancedNode
+    :return: koren dokonale vyvazeneho podstromu
+    """
+    if lower == upper:
+        return None
+    middle = (lower + upper) // 2
+    node = (BalancedNode if balanced else Node)(*intervals[middle])
+    node.left = build_nodes(intervals, lower, middle, balanced)
+    node.right = build_nodes(intervals, middle + 1, upper, balanced)
+    if balanced:
+        balanced_update(node)
+    return node
+
+
+def append_interval(result: List[Tuple[int, int, bool]],
+                    low: int, high: int) -> None:
+    # interval navazujuci na posledny interval vysledku s nim zlucim
+    if result and low <= result[-1][1] + 1:
+        if high > result[-1][1]:
+            result[-1] = (result[-1][0], high, True)
+    else:
+        result.append((low, high, True))
+
+
+def active_intervals(tree: HTree) -> Iterator[Tuple[int, int]]:
+    return iter_intervals(tree, -inf, inf)
+
+
+def union(first: HTree, second: HTree) -> BalancedHTree:
+    """
+    vstup: 'first', 'second' korektní H-stromy
+    vystup: vyvážený H-strom reprezentující sjednocení jejich množin
+    časová složitost: O(n + m), kde n a m jsou počty uzlů stromů
+    """
+    result: List[Tuple[int, int, bool]] = []
+    left = active_intervals(first)
+    right = active_intervals(second)
+    a = next(left, None)
+    b = next(right, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a[0] <= b[0]):
+            low, high = a
+            a = next(left, None)
+        else:
+            low, high = b
+            b = next(right, None)
+        append_interval(result, low, high)
+    return build_balanced(result)
+
+
+def intersection(first: HTree, second: HTree) -> BalancedHTree:
+    """
+    vstup: 'first', 'second' korektní H-stromy
+    vystup: vyvážený H-strom reprezentující průnik jejich množin
+    časová složitost: O(n + m), kde n a m jsou počty uzlů stromů
+    """
+    result: List[Tuple[int, int, bool]] = []
+    left = active_intervals(first)
+    right = active_intervals(second)
+    a = next(left, None)
+    b = next(right, None)
+    while a is not None and b is not None:
+        low, high = max(a[0], b[0]), min(a[1], b[1])
+        if low <= high:
+            append_interval(result, low, high)
+        if a[1] < b[1]:
+            a = next(left, None)
+        else:
+            b = next(right, None)
+    return build_balanced(result)
+
+
+def difference(first: HTree, second: HTree) -> BalancedHTree:
+    """
+    vstup: 'first', 'second' korektní H-stromy
+    vystup: vyvážený H-strom reprezentující rozdíl množin (prvky 'first',
+            které nejsou v 'second')
+    časová složitost: O(n + m), kde n a m jsou počty uzlů stromů
+    """
+    result: List[Tuple[int, int, bool]] = []
+    right = active_intervals(second)
+    b = next(right, None)
+    for low, high in active_intervals(first):
+        # odrezem vsetky intervaly z 'second', ktore zasahuju do [low, high]
+        while b is not None and b[1] < low:
+            b = next(right, None)
+        while b is not None and b[0] <= high:
+            if b[0] > low:
+                append_interval(result, low, b[0] - 1)
+            low = max(low, b[1] + 1)
+            if b[1] > high:
+                break
+            b = next(right, None)
+        if low <= high:
+            append_interval(result, low, high)
+    return build_balanced(result)
+
+
+# Úklid pasivních uzlů
+#
+# Každé delete zanechá ve stromě pasivní uzel. compact strom přebuduje:
+# pasivní uzly zahodí (nebo sousední pasivní intervaly sloučí), sousední
+# aktivní intervaly sloučí a ze zbylých intervalů postaví dokonale vyvážený
+# strom. Reprezentovaná množina se nemění. CompactingHTree navíc spouští
+# úklid automaticky, jakmile podíl uzlů vzniklých mazáním od posledního
+# úklidu překročí zadanou mez.
+
+
+class CompactionReport:
+    """Třída popisující výsledek úklidu stromu.
+
+    Atributy:
+        nodes_before    počet uzlů před úklidem
+        nodes_after     počet uzlů po úklidu
+        height_before   výška stromu před úklidem
+        height_after    výška stromu po úklidu
+    """
+    __slots__ = "nodes_before", "nodes_after", "height_before", "height_after"
+
+    def __init__(self, nodes_before: int, nodes_after: int,
+                 height_before: int, height_after: int) -> None:
+        self.nodes_before = nodes_before
+        self.nodes_after = nodes_after
+        self.height_before = height_before
+        self.height_after = height_after
+
+    @property
+    def reclaimed(self) -> int:
+        return self.nodes_before - self.nodes_after
+
+    def __repr__(self) -> str:
+        return (f"CompactionReport(reclaimed={self.reclaimed}, "
+                f"nodes {self.nodes_before} -> {self.nodes_after}, "
+                f"height {self.height_before} -> {self.height_after})")
+
+
+def compact(tree: HTree, keep_passive: bool = False) -> CompactionReport:
+    """
+    vstup: 'tree' korektní H-strom typu HTree nebo BalancedHTree
+           'keep_passive' pokud je True, pasivní intervaly se nezahazují,
+                          pouze se sloučí sousední pasivní intervaly
+    vystup: popis provedeného úklidu; strom 'tree' je přebudován (uzly
+            stejného typu jako dosud) a reprezentuje stejnou množinu
+    časová složitost: O(n), kde n je počet uzlů stromu 'tree'
+    """
+    intervals: List[Tuple[int, int, bool]] = []
+    nodes = height = 0
+    stack: List[Tuple[Node, int]] = []
+    node = tree.root
+    depth = 1
+    while stack or node is not None:
+        while node is not None:
+            stack.append((node, depth))
+            node = node.left
+            depth += 1
+        node, depth = stack.pop()
+        nodes += 1
+        height = max(height, depth)
+        if node.active or keep_passive:
+            last = intervals[-1] if intervals else None
+            if last is not None and last[2] == node.active and \
+                    last[1] + 1 == node.low:
+                intervals[-1] = (last[0], node.high, node.active)
+            else:
+                intervals.append((node.low, node.high, node.active))
+        node = node.right
+        depth += 1
+
+    tree.root = build_nodes(intervals, 0, len(intervals),
+                            isinstance(tree, BalancedHTree))
+    return CompactionReport(nodes, len(intervals), height,
+                            len(intervals).bit_length())
+
+
+class CompactingHTree(HTree):
+    """Třída reprezentující H-strom s automatickým úklidem.
+
+    Atributy:
+        root        kořen stromu typu Node nebo None
+        threshold   mez (mezi 0 a 1) podílu pasivních uzlů, po jejímž
+                    překročení se spustí compact
+        base_nodes  počet uzlů po posledním úklidu
+        insertions  počet vložení od posledního úklidu
+        deletions   počet mazání od posledního úklidu
+        reports     seznam popisů provedených úklidů
+    """
+    __slots__ = "threshold", "base_nodes", "insertions", "deletions", \
+        "reports"
+
+    def __init__(self, threshold: float = 0.25) -> None:
+        super().__init__()
+        if not 0 < threshold < 1:
+            raise ValueError("threshold must be between 0 and 1")
+        self.threshold = threshold
+        self.base_nodes = 0
+        self.insertions = 0
+        self.deletions = 0
+        self.reports: List[CompactionReport] = []
+
+
+def compacting_insert(tree: CompactingHTree, key: int) -> None:
+    """
+    vstup: 'tree' H-strom s automatickým úklidem
+           'key'  vkládaný klíč
+    vystup: žádný, vloží klíč jako insert
+    časová složitost: O(h), kde h je výška stromu 'tree'
+    """
+    if not contains(tree, key):
+        insert_iter(tree, key)
+        tree.insertions += 1
+
+
+def compacting_delete(tree: CompactingHTree, key: int) \
+        -> Optional[CompactionReport]:
+    """
+    vstup: 'tree' H-strom s automatickým úklidem
+           'key'  klíč ke smazání
+    vystup: smaže klíč jako delete. Každé mazání přidá nejvýše jeden
+            pasivní uzel; pokud odhad podílu pasivních uzlů
+            (mazání / (uzly po úklidu + vložení + mazání)) překročí
+            'tree.threshold', strom se uklidí pomocí compact a funkce vrátí
+            popis úklidu, jinak vrátí None.
+    časová složitost: O(h) amortizovaně, úklid v čase O(n) proběhne
+            nejvýše jednou za Θ(n) mazání
+    """
+    if not contains(tree, key):
+        return None
+    delete_iter(tree, key)
+    tree.deletions += 1
+    if tree.deletions <= tree.threshold * \
+            (tree.base_nodes + tree.insertions + tree.deletions):
+        return None
+
+    report = compact(tree)
+    tree.base_nodes = report.nodes_after
+    tree.insertions = tree.deletions = 0
+    tree.reports.append(report)
+    return report
+
+
+# Binární formát
+#
+# Soubor začíná hlavičkou HTREE_MAGIC a počtem intervalů (8 bajtů), za ní
+# následují vzestupně seřazené záznamy (low, high, active) pevné délky
+# HTREE_RECORD.size. Soubor lze načíst jako vyvážený strom (load_tree), nebo
+# jej namapovat do paměti a odpovídat na dotazy binárním vyhledáváním
+# (MappedHTree) bez stavby stromu.
+
+HTREE_MAGIC = b"HTREE\x00\x01\x00"
+HTREE_HEADER = "<8sQ"
+HTREE_RECORD = "<qq?"
+
+
+def save_tree(tree: HTree, filename: str) -> int:
+    """
+    vstup: 'tree' korektní H-strom
+           'filename' jméno výstupního souboru
+    vystup: počet zapsaných intervalů; intervaly se zapisují průběžně
+            během iterativního průchodu inorder
+    časová složitost: O(n), kde n je počet uzlů stromu 'tree'
+    extra prostorová složitost: O(h)
+    """
+    from struct import Struct, pack
+
+    record = Struct(HTREE_RECORD)
+    count = 0
+    with open(filename, "wb") as file:
+        # pocet intervalov doplnim do hlavicky az na konci
+        file.write(pack(HTREE_HEADER, HTREE_MAGIC, 0))
+        stack: List[Node] = []
+        node = tree.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            file.write(record.pack(node.low, node.high, node.active))
+            count += 1
+            node = node.right
+        file.seek(0)
+        file.write(pack(HTREE_HEADER, HTREE_MAGIC, count))
+    return count
+
+
+def read_header(data: bytes) -> int:
+    from struct import calcsize, unpack_from
+
+    if len(data) < calcsize(HTREE_HEADER):
+        raise ValueError("not an H-tree file")
+    magic, count = unpack_from(HTREE_HEADER, data)
+    if magic != HTREE_MAGIC or \
+            len(data) < calcsize(HTREE_HEADER) + \
+            count * calcsize(HTREE_RECORD):
+        raise ValueError("not an H-tree file")
+    return count
+
+
+def load_tree(filename: str, balanced: bool = True) -> HTree:
+    """
+    vstup: 'filename' soubor zapsaný pomocí save_tree
+           'balanced' pokud je True, výsledek je BalancedHTree, jinak HTree
+    vystup: dokonale vyvážený H-strom se stejnou inorder posloupností
+            intervalů jako uložený strom
+    časová složitost: O(n), kde n je počet uložených intervalů
+    """
+    from struct import calcsize, iter_unpack
+
+    with open(filename, "rb") as file:
+        data = file.read()
+    count = read_header(data)
+    start = calcsize(HTREE_HEADER)
+    end = start + count * calcsize(HTREE_RECORD)
+    intervals = list(iter_unpack(HTREE_RECORD, data[start:end]))
+
+    tree = BalancedHTree() if balanced else HTree()
+    tree.root = build_nodes(intervals, 0, count, balanced)
+    return tree
+
+
+class MappedHTree:
+    """Třída reprezentující H-strom uložený v souboru namapovaném do paměti
+    (pouze pro čtení).
+
+    Atributy:
+        file    otevřený soubor
+        data    namapovaný obsah souboru
+        count   počet uložených intervalů
+    """
+    __slots__ = "file", "data", "count"
+
+    def __init__(self, filename: str) -> None:
+        import mmap
+
+        self.file = open(filename, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = read_header(self.data)
+
+    def close(self) -> None:
+        self.data.close()
+        self.file.close()
+
+
+def mapped_interval(tree: MappedHTree, index: int) -> Tuple[int, int, bool]:
+    from struct import calcsize, unpack_from
+
+    return unpack_from(HTREE_RECORD, tree.data, calcsize(HTREE_HEADER) +
+                       index * calcsize(HTREE_RECORD))
+
+
+def mapped_contains(tree: MappedHTree, key: int) -> bool:
+    """
+    vstup: 'tree' namapovaný H-strom
+           'key'  hledaný klíč
+    vystup: True, pokud 'key' patří do reprezentované množiny, False jinak
+    časová složitost: O(log n), kde n je počet uložených intervalů
+    """
+    # hladam posledny interval s dolnou hranicou nanajvys key
+    lower, upper = 0, tree.count
+    while lower < upper:
+        middle = (lower + upper) // 2
+        if mapped_interval(tree, middle)[0] <= key:
+            lower = middle + 1
+        else:
+            upper = middle
+    if lower == 0:
+        return False
+    _, high, active = mapped_interval(tree, lower - 1)
+    return active and key <= high
+
+
+# Hybridní reprezentace množiny
+#
+# Pro husté a roztříštěné množiny je strom s jedním uzlem na každý úsek
+# po sobě jdoucích čísel paměťově drahý. HybridSet dělí čísla na bloky
+# po 2^HYBRID_CHUNK_BITS hodnotách (podobně jako roaring bitmapy). Řídké
+# bloky a bloky z dlouhých úseků zůstávají ve vyváženém H-stromě se
+# slučováním intervalů (což je vlastně run-length reprezentace); blok, který
+# má mnoho prvků roztříštěných do mnoha úseků, se převede na bitmapu.
+# Operace insert, delete a contains mají stejnou sémantiku vůči
+# reprezentované množině jako u H-stromu.
+
+HYBRID_CHUNK_BITS = 16
+
+
+class HybridSet:
+    """Třída reprezentující množinu celých čísel jako H-strom a bitmapy.
+
+    Atributy:
+        tree          vyvážený H-strom s řídkými bloky
+        bitmaps       slovník: číslo bloku -> bitmapa bloku (bytearray)
+        counts        slovník: číslo bloku -> počet prvků v bitmapě
+        bitmap_runs   blok s alespoň tolika prvky a úseky se převede
+                      na bitmapu; bitmapa s méně než polovinou tolika prvků
+                      se převede zpět do stromu
+    """
+    __slots__ = "tree", "bitmaps", "counts", "bitmap_runs"
+
+    def __init__(self, bitmap_runs: int = 128) -> None:
+        self.tree = BalancedHTree()
+        self.bitmaps: Dict[int, bytearray] = {}
+        self.counts: Dict[int, int] = {}
+        self.bitmap_runs = bitmap_runs
+
+
+def hybrid_contains(hybrid: HybridSet, key: int) -> bool:
+    """
+    vstup: 'hybrid' množina typu HybridSet
+           'key'  hledaný klíč
+    vystup: True, pokud 'key' patří do množiny, False jinak
+    časová složitost: O(1) v bitmapovém bloku, jinak O(log n)
+    """
+    bitmap = hybrid.bitmaps.get(key >> HYBRID_CHUNK_BITS)
+    if bitmap is None:
+        return contains(hybrid.tree, key)
+    offset = key & ((1 << HYBRID_CHUNK_BITS) - 1)
+    return bool(bitmap[offset >> 3] & (1 << (offset & 7)))
+
+
+def hybrid_insert(hybrid: HybridSet, key: int) -> None:
+    """
+    vstup: 'hybrid' množina typu HybridSet
+           'key'  vkládaný klíč
+    vystup: žádný, přidá 'key' do množiny
+    časová složitost: O(1) v bitmapovém bloku, jinak O(log n) plus
+            amortizovaná cena převodu bloku na bitmapu
+    """
+    chunk = key >> HYBRID_CHUNK_BITS
+    bitmap = hybrid.bitmaps.get(chunk)
+    if bitmap is not None:
+        offset = key & ((1 << HYBRID_CHUNK_BITS) - 1)
+        if not bitmap[offset >> 3] & (1 << (offset & 7)):
+            bitmap[offset >> 3] |= 1 << (offset & 7)
+            hybrid.counts[chunk] += 1
+        return
+
+    coalescing_insert(hybrid.tree, key)
+    low = chunk << HYBRID_CHUNK_BITS
+    high = low + (1 << HYBRID_CHUNK_BITS) - 1
+    if count_range(hybrid.tree, low, high) < hybrid.bitmap_runs:
+        return
+    runs = list(iter_intervals(hybrid.tree, low, high))
+    if len(runs) < hybrid.bitmap_runs:
+        return
+
+    # blok je husty a roztriesteny, prevediem ho na bitmapu
+    bitmap = bytearray(1 << (HYBRID_CHUNK_BITS - 3))
+    count = 0
+    for start, end in runs:
+        for value in range(start - low, end - low + 1):
+            bitmap[value >> 3] |= 1 << (value & 7)
+        count += end - start + 1
+    delete_range(hybrid.tree, low, high)
+    hybrid.bitmaps[chunk] = bitmap
+    hybrid.counts[chunk] = count
+
+
+def hybrid_delete(hybrid: HybridSet, key: int) -> None:
+    """
+    vstup: 'hybrid' množina typu HybridSet
+           'key'  klíč ke smazání
+    vystup: žádný, odebere 'key' z množiny
+    časová složitost: O(1) v bitmapovém bloku, jinak O(log n) plus
+            amortizovaná cena převodu bitmapy zpět do stromu
+    """
+    chunk = key >> HYBRID_CHUNK_BITS
+    bitmap = hybrid.bitmaps.get(chunk)
+    if bitmap is None:
+        balanced_delete(hybrid.tree, key)
+        return
+
+    offset = key & ((1 << HYBRID_CHUNK_BITS) - 1)
+    if not bitmap[offset >> 3] & (1 << (offset & 7)):
+        return
+    bitmap[offset >> 3] &= ~(1 << (offset & 7)) & 0xff
+    hybrid.counts[chunk] -= 1
+    if 2 * hybrid.counts[chunk] >= hybrid.bitmap_runs:
+        return
+
+    # bitmapa je uz ridka, usekmi ju vratim do stromu
+    low = chunk << HYBRID_CHUNK_BITS
+    del hybrid.bitmaps[chunk]
+    del hybrid.counts[chunk]
+    start = None
+    for value in range((1 << HYBRID_CHUNK_BITS) + 1):
+        present = value < (1 << HYBRID_CHUNK_BITS) and \
+            bitmap[value >> 3] & (1 << (value & 7))
+        if present and start is None:
+            start = value
+        elif not present and start is not None:
+            insert_range(hybrid.tree, low + start, low + value - 1)
+            start = None
+
+
+def benchmark_hybrid(count: int = 1 << 18, seed: int = 0) -> None:
+    """
+    Vloží náhodnou polovinu čísel 0, ..., count - 1 do BalancedHTree
+    (se slučováním) a do HybridSet a vypíše použitou paměť a časy.
+    """
+    import random
+    import tracemalloc
+    from time import perf_counter
+
+    keys = random.Random(seed).sample(range(count), count // 2)
+    for name, make, fun in (
+            ("BalancedHTree", BalancedHTree, coalescing_insert),
+            ("HybridSet", HybridSet, hybrid_insert)):
+        tracemalloc.start()
+        start = perf_counter()
+        structure = make()
+        for key in keys:
+            fun(structure, key)
+        elapsed = perf_counter() - start
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{name}: {used / len(keys):.2f} B na prvek, "
+              f"{elapsed:.2f} s (s tracemalloc)")
+
+
+def benchmark_sequential(count: int = 10 ** 5, plain_count: int = 900) \
+        -> None:
+    """
+    Vloží klíče 0, ..., count - 1 vzestupně a pak smaže každý druhý
+    z nich, jednou do BalancedHTree a jednou (pro plain_count klíčů) do HTree.
+    Vypíše časy a výsledné výšky. Pro HTree s více než zhruba 1000 klíči
+    dojde k přetečení zásobníku rekurze, což se také vypíše.
+    """
+    from time import perf_counter
+
+    def height(node: Optional[Node]) -> int:
+        result = 0
+        level = [node] if node is not None else []
+        while level:
+            result += 1
+            level = [child for item in level
+                     for child in (item.left, item.right)
+                     if child is not None]
+        return result
+
+    for name, tree, ins, dele, n in (
+            ("BalancedHTree", BalancedHTree(), balanced_insert,
+             balanced_delete, count),
+            ("HTree", HTree(), insert, delete, plain_count)):
+        start = perf_counter()
+        try:
+            for key in range(n):
+                ins(tree, key)
+            for key in range(0, n, 2):
+                dele(tree, key)
+        except RecursionError:
+            print(f"{name}: {n} klíčů – přetečení zásobníku rekurze")
+            continue
+        elapsed = perf_counter() - start
+        print(f"{name}: {n} klíčů, {elapsed:.3f} s, "
+              f"{elapsed / (n + n // 2) * 1e6:.2f} µs na operaci, "
+              f"výška {height(tree.root)}")
+
+
 # Soubory .dot z testů vykreslíte např. programem xdot;
 # případně použijte online verzi: http://dreampuf.github.io/GraphvizOnline/
 #
@@ -464,6 +1741,41 @@ class Ib002TestCase:
         return False
 
 
+def ib002_copy_node_iter(node: Optional[Node]) -> Optional[Node]:
+    """Iterativní varianta Ib002TestCase.copy_node."""
+    if node is None:
+        return None
+    root = Node(node.low, node.high, node.active)
+    stack = [(node, root)]
+    while stack:
+        original, copy = stack.pop()
+        if original.left is not None:
+            copy.left = Node(original.left.low, original.left.high,
+                             original.left.active)
+            stack.append((original.left, copy.left))
+        if original.right is not None:
+            copy.right = Node(original.right.low, original.right.high,
+                              original.right.active)
+            stack.append((original.right, copy.right))
+    return root
+
+
+def ib002_to_array_iter(node: Optional[Node]) -> Optional[List[Any]]:
+    """Iterativní varianta Ib002TestCase.to_array."""
+    if node is None:
+        return None
+    root: List[Any] = [(node.low, node.high, node.active), None, None]
+    stack = [(node, root)]
+    while stack:
+        original, array = stack.pop()
+        for index, child in (1, original.left), (2, original.right):
+            if child is not None:
+                array[index] = [(child.low, child.high, child.active),
+                                None, None]
+                stack.append((child, array[index]))
+    return root
+
+
 IB002_CASES = [
     # 0
     Ib002TestCase([(6, 6, False),
@@ -1456,6 +2768,9 @@ IB002_TEST_DESCRIPTIONS: List[Ib002Test] = [
     (is_correct, ib002_check_iscorrect, 0),
     (insert, ib002_check_expected, 1),
     (delete, ib002_check_expected, 2),
+    (is_correct_iter, ib002_check_iscorrect, 0),
+    (insert_iter, ib002_check_expected, 1),
+    (delete_iter, ib002_check_expected, 2),
 ]
 
 
@@ -1464,5 +2779,313 @@ def ib002_main() -> None:
         ib002_run_both_tests(test)
 
 
+# Náhodné testování
+#
+# ib002_stress generuje náhodné korektní H-stromy a náhodné posloupnosti
+# operací insert a delete a porovnává výsledky s referenčním modelem
+# (množinou aktivních čísel v Pythonu). Po každé operaci se ověří klíč
+# a jeho sousedé, celý strom se porovná s modelem jednou za 'full_every'
+# operací a na konci. Chybný případ se zmenší (zahazováním operací
+# a intervalů vstupního stromu) a vypíše ve formátu IB002_CASES.
+
+Ib002Interval = Tuple[int, int, bool]
+Ib002Operation = Tuple[str, int]
+
+
+def ib002_random_intervals(rng: Any, count: int,
+                           max_gap: int = 3,
+                           max_length: int = 4) -> List[Ib002Interval]:
+    intervals = []
+    low = 0
+    for _ in range(count):
+        low += rng.randint(1, max_gap)
+        high = low + rng.randint(0, max_length - 1)
+        intervals.append((low, high, rng.random() < 0.5))
+        low = high + 1
+    return intervals
+
+
+def ib002_random_tree(intervals: List[Ib002Interval], seed: int) -> HTree:
+    """Postaví H-strom s danými intervaly a náhodným tvarem (iterativně)."""
+    import random
+
+    rng = random.Random(seed)
+    tree = HTree()
+    stack: List[Tuple[int, int, Optional[Node], bool]] = \
+        [(0, len(intervals), None, False)]
+    while stack:
+        lower, upper, parent, is_left = stack.pop()
+        if lower == upper:
+            continue
+        middle = rng.randrange(lower, upper)
+        node = Node(*intervals[middle])
+        if parent is None:
+            tree.root = node
+        elif is_left:
+            parent.left = node
+        else:
+            parent.right = node
+        stack.append((lower, middle, node, True))
+        stack.append((middle + 1, upper, node, False))
+    return tree
+
+
+def ib002_run_operations(intervals: List[Ib002Interval], seed: int,
+                         operations: List[Ib002Operation],
+                         insert_fun: Callable[[HTree, int], None],
+                         delete_fun: Callable[[HTree, int], None],
+                         full_every: int) -> Optional[int]:
+    """
+    Provede operace na stromu a modelu; vrátí index první operace, po níž
+    se strom od modelu liší (nebo není korektní), jinak None.
+    """
+    tree = ib002_random_tree(intervals, seed)
+    model = {value for low, high, active in intervals if active
+             for value in range(low, high + 1)}
+
+    def full_check() -> bool:
+        return is_correct_iter(tree) and \
+            set(iter_members(tree, -inf, inf)) == model
+
+    for index, (kind, key) in enumerate(operations):
+        try:
+            if kind == "insert":
+                insert_fun(tree, key)
+                model.add(key)
+            else:
+                delete_fun(tree, key)
+                model.discard(key)
+            ok = all(contains(tree, value) == (value in model)
+                     for value in (key - 1, key, key + 1))
+            if ok and (index + 1) % full_every == 0:
+                ok = full_check()
+        except Exception:
+            ok = False
+        if not ok:
+            return index
+
+    return None if full_check() else len(operations) - 1
+
+
+def ib002_shrink_list(items: List[Any],
+                      fails: Callable[[List[Any]], bool]) -> List[Any]:
+    chunk = max(len(items) // 2, 1)
+    while items:
+        index = 0
+        removed = False
+        while index < len(items):
+            candidate = items[:index] + items[index + chunk:]
+            if fails(candidate):
+                items = candidate
+                removed = True
+            else:
+                index += chunk
+        if not removed:
+            if chunk == 1:
+                break
+            chunk //= 2
+    return items
+
+
+def ib002_stress(operations: int = 10 ** 5, tree_size: int = 1000,
+                 seed: int = 0,
+                 insert_fun: Callable[[HTree, int], None] = insert_iter,
+                 delete_fun: Callable[[HTree, int], None] = delete_iter,
+                 full_every: int = 10 ** 4) -> bool:
+    """
+    Náhodný test operací 'insert_fun' a 'delete_fun' proti modelu.
+    Vrátí True, pokud se nenašla chyba; jinak vypíše zmenšený chybný
+    případ a vrátí False.
+    """
+    import random
+
+    rng = random.Random(seed)
+    intervals = ib002_random_intervals(rng, tree_size)
+    span = intervals[-1][1] + 2 if intervals else 10
+    ops = [("insert" if rng.random() < 0.5 else "delete",
+            rng.randint(-1, span)) for _ in range(operations)]
+
+    failed = ib002_run_operations(intervals, seed, ops, insert_fun,
+                                  delete_fun, full_every)
+    if failed is None:
+        return True
+
+    def fails(candidate_intervals: List[Ib002Interval],
+              candidate_ops: List[Ib002Operation]) -> bool:
+        return ib002_run_operations(candidate_intervals, seed,
+                                    candidate_ops, insert_fun,
+                                    delete_fun, 1) is not None
+
+    ops = ops[:failed + 1]
+    ops = ib002_shrink_list(ops, lambda c: fails(intervals, c))
+    intervals = ib002_shrink_list(intervals, lambda c: fails(c, ops))
+    ops = ib002_shrink_list(ops, lambda c: fails(intervals, c))
+
+    tree = ib002_random_tree(intervals, seed)
+    print("Náhodný test našel chybu.")
+    print("Vstupní strom:", ib002_to_array_iter(tree.root))
+    print("Operace:", ops)
+    return False
+
+
+# Paralelní režim testů
+#
+# Případy jednoho testu běží v procesech (ProcessPoolExecutor) a u každého
+# se vypíše doba běhu. Při testování insert a delete se strom nekopíruje
+# pro každý klíč: před operací se uloží jen uzly na cestách, které operace
+# může změnit (cesta ke klíči a k sousedům intervalu, který jej obsahuje),
+# výsledek se porovná s očekávaným stromem iterativně a poté se uložené
+# uzly obnoví. Že operace nezměnila jiné uzly, se ověří jednou na konci
+# případu porovnáním se vstupním stromem.
+
+Ib002Snapshot = Tuple[Optional[Node], List[Tuple[Node, int, int, bool,
+                                                 Optional[Node],
+                                                 Optional[Node]]]]
+
+
+def ib002_search_path(tree: HTree, key: int, shift: int = 0) -> List[Node]:
+    """
+    Cesta hledání hodnoty key (shift == 0), resp. hodnoty nepatrně menší
+    (shift == -1) či větší (shift == 1) než key.
+    """
+    path = []
+    node = tree.root
+    while node is not None:
+        path.append(node)
+        if key < node.low or (shift < 0 and key == node.low):
+            node = node.left
+        elif key > node.high or (shift > 0 and key == node.high):
+            node = node.right
+        else:
+            break
+    return path
+
+
+def ib002_save_paths(tree: HTree, key: int) -> Ib002Snapshot:
+    path = ib002_search_path(tree, key)
+    nodes = list(path)
+    if path and path[-1].low <= key <= path[-1].high:
+        # delete vklada zvysky intervalu k predchodcovi a nasledovnikovi
+        nodes += ib002_search_path(tree, path[-1].low, -1)
+        nodes += ib002_search_path(tree, path[-1].high, 1)
+    return tree.root, [(node, node.low, node.high, node.active,
+                        node.left, node.right) for node in nodes]
+
+
+def ib002_restore_paths(tree: HTree, snapshot: Ib002Snapshot) -> None:
+    tree.root, saved = snapshot
+    for node, low, high, active, left, right in saved:
+        node.low, node.high, node.active = low, high, active
+        node.left, node.right = left, right
+
+
+def ib002_same_tree(node: Optional[Node], array: Optional[List[Any]]) -> bool:
+    """Iterativně porovná strom se seznamovou reprezentací z testů."""
+    stack = [(node, array)]
+    while stack:
+        node, array = stack.pop()
+        if node is None or not array:
+            if node is not None or array:
+                return False
+            continue
+        if (node.low, node.high, node.active) != array[0]:
+            return False
+        stack.append((node.left, array[1]))
+        stack.append((node.right, array[2]))
+    return True
+
+
+def ib002_check_array_fast(fun: Callable[[HTree, int], None],
+                           test: Ib002Test, name: str, case: Ib002TestCase,
+                           data: List[Tuple[int, Any]]) -> bool:
+    if not case.correct:
+        return True
+    tree = case.tree
+    for key, exp in data:
+        snapshot = ib002_save_paths(tree, key)
+        fun(tree, key)
+        if not ib002_same_tree(tree.root, exp):
+            case.expected = exp
+            ib002_check_expected(name, case, tree)
+            ib002_restore_paths(tree, snapshot)
+            ib002_report_tree(name, tree)
+            print("Vstupní parametr key:", key)
+            ib002_reset_case_tree(case)
+            return False
+        ib002_restore_paths(tree, snapshot)
+
+    if not ib002_same_tree(tree.root, case.array):
+        print("Došlo k modifikaci vstupního stromu.")
+        ib002_reset_case_tree(case)
+        return False
+    return True
+
+
+def ib002_reset_case_tree(case: Ib002TestCase) -> None:
+    # chybna funkcia mohla zmenit aj uzly mimo ulozenych ciest; strom
+    # pripadu je zdielany dalsimi testami v tom istom procese
+    if not ib002_same_tree(case.tree.root, case.array):
+        case.tree.root = ib002_build_tree(case.array)
+
+
+def ib002_fast_template(test: Ib002Test, case: Ib002TestCase) -> bool:
+    fun, _, which = test
+    if which == 1:
+        return ib002_check_array_fast(fun, test, fun.__name__, case,
+                                      case.inputs)
+    if which == 2:
+        return ib002_check_array_fast(fun, test, fun.__name__, case,
+                                      case.remove)
+    return ib002_test_template(test, case)
+
+
+def ib002_run_case(test_index: int, case_index: int) \
+        -> Tuple[bool, float, str]:
+    import io
+    from contextlib import redirect_stdout
+    from time import perf_counter
+
+    test = IB002_TEST_DESCRIPTIONS[test_index]
+    case = IB002_CASES[case_index]
+    output = io.StringIO()
+    start = perf_counter()
+    with redirect_stdout(output):
+        ok = ib002_try_test(ib002_fast_template, test, case)
+    return ok, perf_counter() - start, output.getvalue()
+
+
+def ib002_run_test_parallel(pool: Any, test_index: int,
+                            case_indices: List[int], basic: bool) -> bool:
+    ib002_test_header(IB002_TEST_DESCRIPTIONS[test_index][0].__name__, basic)
+    results = pool.map(ib002_run_case, [test_index] * len(case_indices),
+                       case_indices)
+    all_ok = True
+    for index, (ok, elapsed, output) in zip(case_indices, results):
+        print(output, end="")
+        print(f"  případ {index}: {elapsed * 1000:.2f} ms"
+              f"{'' if ok else ' (FAIL)'}")
+        all_ok = all_ok and ok
+    return ib002_test_report(all_ok, basic)
+
+
+def ib002_main_parallel(workers: Optional[int] = None) -> None:
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as pool:
+        for index, test in enumerate(IB002_TEST_DESCRIPTIONS):
+            # if basic test fails, full tests are not run
+            if ib002_run_test_parallel(pool, index, IB002_BASIC[test[2]],
+                                       basic=True):
+                ib002_run_test_parallel(pool, index,
+                                        list(range(len(IB002_CASES))),
+                                        basic=False)
+
+
 if __name__ == '__main__':
-    ib002_main()
+    import sys
+    if "--parallel" in sys.argv:
+        ib002_main_parallel()
+    elif "--stress" in sys.argv:
+        ib002_test_report(ib002_stress(), basic=False)
+    else:
+        ib002_main()
@@ -5,7 +5,8 @@
 # reprezentující frontu. Pro její import použijte přesně následující řádek:
 # from collections import deque
 
-from typing import List
+from array import array
+from typing import Any, Iterable, Iterator, List, Set, Tuple
 
 # IB002 Domácí úloha 11
 #
@@ -232,6 +233,1469 @@ def in_degrees(graph: Graph) -> List[int]:
     return in_degrees
 
 
+# Rozšíření: iterativní Tarjanův algoritmus
+#
+# strongly_connected_components výše je rekurzivní (na grafech s dlouhými
+# cestami narazí na limit rekurze) a staví transponovaný graf. Následující
+# funkce najde tytéž komponenty Tarjanovým algoritmem jedním průchodem
+# do hloubky s explicitními zásobníky a bez kopie grafu.
+
+def strongly_connected_components_iter(graph: Graph) -> List[List[int]]:
+    """
+    vstup: ‹graph› – orientovaný graf (objekt typu ‹Graph›)
+    výstup: seznam všech silně souvislých komponent grafu (viz
+            strongly_connected_components); komponenty jsou v pořadí,
+            v němž je Tarjanův algoritmus dokončí, tj. v opačném
+            topologickém pořadí grafu komponent
+    časová složitost: O(|V| + |E|)
+    extra prostorová složitost: O(|V|)
+    """
+    size = graph.size
+    succs = graph.succs
+    index = [-1] * size
+    low = [0] * size
+    on_stack = [False] * size
+    stack: List[int] = []
+    result = []
+    counter = 0
+
+    for root in range(size):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        # zásobník volání: vrchol a pozice dalšího zpracovávaného následníka
+        call = [root]
+        position = [0]
+
+        while call:
+            vertex = call[-1]
+            vertex_succs = succs[vertex]
+            i = position[-1]
+            descended = False
+            while i < len(vertex_succs):
+                succ = vertex_succs[i]
+                i += 1
+                if index[succ] < 0:
+                    position[-1] = i
+                    index[succ] = low[succ] = counter
+                    counter += 1
+                    stack.append(succ)
+                    on_stack[succ] = True
+                    call.append(succ)
+                    position.append(0)
+                    descended = True
+                    break
+                if on_stack[succ] and index[succ] < low[vertex]:
+                    low[vertex] = index[succ]
+            if descended:
+                continue
+
+            call.pop()
+            position.pop()
+            if low[vertex] == index[vertex]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == vertex:
+                        break
+                result.append(component)
+            if call and low[vertex] < low[call[-1]]:
+                low[call[-1]] = low[vertex]
+
+    return result
+
+
+def random_graph(size: int, edges: int, seed: int = 0) -> Graph:
+    import random
+
+    rng = random.Random(seed)
+    graph = Graph(size)
+    for _ in range(edges):
+        graph.succs[rng.randrange(size)].append(rng.randrange(size))
+    return graph
+
+
+def cycle_graph(size: int) -> Graph:
+    graph = Graph(size)
+    for vertex in range(size - 1):
+        graph.succs[vertex].append(vertex + 1)
+    if size > 0:
+        graph.succs[size - 1].append(0)
+    return graph
+
+
+def benchmark_scc(size: int = 10 ** 6, edges: int = 10 ** 7,
+                  seed: int = 0) -> None:
+    """
+    Porovná strongly_connected_components a
+    strongly_connected_components_iter na náhodném grafu se ‹size› vrcholy
+    a ‹edges› hranami a na cyklu délky ‹size›. (Náhodný graf s 10^7 hranami
+    zabere v seznamech následníků několik GB paměti.)
+    """
+    from time import perf_counter
+
+    for name, graph in ("náhodný graf", random_graph(size, edges, seed)), \
+                       ("cyklus", cycle_graph(size)):
+        for fun in strongly_connected_components, \
+                strongly_connected_components_iter:
+            start = perf_counter()
+            try:
+                components = fun(graph)
+            except RecursionError:
+                print(f"{name}, {fun.__name__}: přetečení zásobníku rekurze")
+                continue
+            print(f"{name}, {fun.__name__}: {perf_counter() - start:.2f} s, "
+                  f"{len(components)} komponent")
+
+
+# Rozšíření: graf v reprezentaci CSR
+#
+# CSRGraph ukládá následníky všech vrcholů za sebou do jednoho pole
+# ‹targets›; následníci vrcholu ‹v› jsou targets[offsets[v]:offsets[v + 1]].
+# Obě pole jsou typu array('i'), hrana tedy zabere 4 bajty místo ukazatele
+# a objektu int v seznamu. Atribut ‹succs› poskytuje pohled CSRSuccessors
+# se stejným rozhraním jako seznam seznamů (succs[v] vrací memoryview bez
+# kopírování), takže CSRGraph lze předat všem funkcím v tomto souboru.
+
+class CSRSuccessors:
+    """Pohled na následníky vrcholů grafu CSRGraph."""
+    __slots__ = "offsets", "targets"
+
+    def __init__(self, offsets: array, targets: array):
+        self.offsets = offsets
+        self.targets = memoryview(targets)
+
+    def __getitem__(self, vertex: int) -> memoryview:
+        return self.targets[self.offsets[vertex]:self.offsets[vertex + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class CSRGraph(Graph):
+    """Třída CSRGraph reprezentuje orientovaný graf ve formátu CSR.
+
+    Atributy:
+        size     počet vrcholů grafu
+        offsets  pole délky size + 1, následníci vrcholu ‹v› jsou
+                 targets[offsets[v]:offsets[v + 1]]
+        targets  pole následníků všech vrcholů
+        succs    pohled na následníky (objekt typu CSRSuccessors)
+    """
+    __slots__ = 'offsets', 'targets'
+
+    def __init__(self, offsets: array, targets: array):
+        self.size = len(offsets) - 1
+        self.offsets = offsets
+        self.targets = targets
+        self.succs = CSRSuccessors(offsets, targets)  # type: ignore
+
+
+def csr_from_graph(graph: Graph) -> CSRGraph:
+    """
+    vstup: ‹graph› – orientovaný graf
+    výstup: tentýž graf ve formátu CSR (pořadí následníků se zachová)
+    časová složitost: O(|V| + |E|)
+    """
+    offsets = array('i', [0])
+    targets = array('i')
+    for vertex in range(graph.size):
+        targets.extend(graph.succs[vertex])
+        offsets.append(len(targets))
+    return CSRGraph(offsets, targets)
+
+
+def csr_from_edges(size: int, edges: List[Tuple[int, int]]) -> CSRGraph:
+    """
+    vstup: ‹size› – počet vrcholů
+           ‹edges› – seznam hran (u, v)
+    výstup: graf ve formátu CSR; následníci každého vrcholu jsou v pořadí,
+            v jakém se jeho hrany vyskytují v ‹edges›
+    časová složitost: O(|V| + |E|) (dva průchody, třídění počítáním)
+    """
+    offsets = array('i', bytes(4 * (size + 1)))
+    for source, _ in edges:
+        offsets[source + 1] += 1
+    for vertex in range(size):
+        offsets[vertex + 1] += offsets[vertex]
+
+    targets = array('i', bytes(4 * len(edges)))
+    position = array('i', offsets[:-1])
+    for source, target in edges:
+        targets[position[source]] = target
+        position[source] += 1
+    return CSRGraph(offsets, targets)
+
+
+def csr_in_degrees(graph: CSRGraph) -> List[int]:
+    """
+    vstup: ‹graph› – graf ve formátu CSR
+    výstup: seznam vstupních stupňů vrcholů (viz in_degrees); místo
+            průchodu seznamy následníků stačí projít pole ‹targets›
+    časová složitost: O(|V| + |E|)
+    """
+    result = [0] * graph.size
+    for target in graph.targets:
+        result[target] += 1
+    return result
+
+
+def csr_shrink(graph: CSRGraph, components: List[List[int]]) -> CSRGraph:
+    """
+    vstup: ‹graph› – graf ve formátu CSR
+           ‹components› – silně souvislé komponenty grafu
+    výstup: graf komponent ve formátu CSR se stejnými hranami jako shrink
+    časová složitost: O(|V| + |E|)
+    """
+    label = [0] * graph.size
+    for i, component in enumerate(components):
+        for vertex in component:
+            label[vertex] = i
+
+    offsets = array('i', [0])
+    targets = array('i')
+    graph_offsets, graph_targets = graph.offsets, graph.targets
+    for component in components:
+        for vertex in component:
+            own = label[vertex]
+            for j in range(graph_offsets[vertex], graph_offsets[vertex + 1]):
+                target = label[graph_targets[j]]
+                if target != own:
+                    targets.append(target)
+        offsets.append(len(targets))
+    return CSRGraph(offsets, targets)
+
+
+def benchmark_csr(size: int = 10 ** 5, edges: int = 10 ** 6,
+                  seed: int = 0) -> None:
+    """
+    Porovná paměť a čas výpočtu SCC a vstupních stupňů pro Graph
+    a CSRGraph na náhodném grafu.
+    """
+    import tracemalloc
+    from time import perf_counter
+
+    tracemalloc.start()
+    graph = random_graph(size, edges, seed)
+    graph_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracemalloc.start()
+    csr = csr_from_graph(graph)
+    csr_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"Graph: {graph_memory / edges:.1f} B na hranu, "
+          f"CSRGraph: {csr_memory / edges:.1f} B na hranu")
+
+    for name, fun, arg in (
+            ("in_degrees(Graph)", in_degrees, graph),
+            ("csr_in_degrees(CSRGraph)", csr_in_degrees, csr),
+            ("SCC iter (Graph)", strongly_connected_components_iter, graph),
+            ("SCC iter (CSRGraph)", strongly_connected_components_iter,
+             csr)):
+        start = perf_counter()
+        fun(arg)
+        print(f"{name}: {perf_counter() - start:.2f} s")
+
+
+# Rozšíření: graf komponent (kondenzace)
+#
+# Condensation se spočítá jednou a pak odpovídá na dotazy na terminální
+# a iniciální komponenty a na dosažitelnost bez dalšího hledání komponent.
+# Na rozdíl od shrink neobsahuje graf komponent násobné hrany.
+# Komponenty jsou očíslovány v pořadí, v jakém je dokončí Tarjanův
+# algoritmus, hrany grafu komponent tedy vedou vždy z komponenty s vyšším
+# číslem do komponenty s nižším číslem.
+
+class Condensation:
+    """Třída Condensation reprezentuje graf silně souvislých komponent.
+
+    Atributy:
+        components  seznam komponent (seznamů vrcholů)
+        label       label[v] je číslo komponenty vrcholu ‹v›
+        dag         graf komponent bez násobných hran a smyček
+        order       čísla komponent v topologickém pořadí
+        in_degree   vstupní stupně komponent v ‹dag›
+        out_degree  výstupní stupně komponent v ‹dag›
+    """
+    __slots__ = 'components', 'label', 'dag', 'order', 'in_degree', \
+        'out_degree'
+
+    def __init__(self, components: List[List[int]], label: List[int],
+                 dag: Graph, in_degree: List[int]):
+        self.components = components
+        self.label = label
+        self.dag = dag
+        self.order = list(range(len(components) - 1, -1, -1))
+        self.in_degree = in_degree
+        self.out_degree = [len(succs) for succs in dag.succs]
+
+
+def condense(graph: Graph) -> Condensation:
+    """
+    vstup: ‹graph› – orientovaný graf (objekt typu ‹Graph›)
+    výstup: graf silně souvislých komponent grafu ‹graph›
+    časová složitost: O(|V| + |E|)
+    """
+    components = strongly_connected_components_iter(graph)
+    count = len(components)
+    label = [0] * graph.size
+    for i, component in enumerate(components):
+        for vertex in component:
+            label[vertex] = i
+
+    dag = Graph(count)
+    in_degree = [0] * count
+    # seen[c] je číslo komponenty, z níž jsme naposledy přidali hranu do c
+    seen = [-1] * count
+    for i, component in enumerate(components):
+        dag_succs = dag.succs[i]
+        for vertex in component:
+            for succ in graph.succs[vertex]:
+                target = label[succ]
+                if target != i and seen[target] != i:
+                    seen[target] = i
+                    dag_succs.append(target)
+                    in_degree[target] += 1
+
+    return Condensation(components, label, dag, in_degree)
+
+
+def condensation_terminal(condensation: Condensation) -> List[List[int]]:
+    """
+    vstup: ‹condensation› – graf komponent
+    výstup: terminální silně souvislé komponenty (viz terminal_sccs)
+    časová složitost: O(počet komponent)
+    """
+    return [component for component, degree
+            in zip(condensation.components, condensation.out_degree)
+            if degree == 0]
+
+
+def condensation_initial(condensation: Condensation) -> List[List[int]]:
+    """
+    vstup: ‹condensation› – graf komponent
+    výstup: iniciální silně souvislé komponenty (viz initial_sccs)
+    časová složitost: O(počet komponent)
+    """
+    return [component for component, degree
+            in zip(condensation.components, condensation.in_degree)
+            if degree == 0]
+
+
+def condensation_reachable(condensation: Condensation,
+                           source: int, target: int) -> bool:
+    """
+    vstup: ‹condensation› – graf komponent
+           ‹source›, ‹target› – vrcholy původního grafu
+    výstup: ‹True›, pokud je ‹target› dosažitelný z ‹source›
+    časová složitost: O(|V'| + |E'|) pro graf komponent v nejhorším
+        případě; prohledávají se jen komponenty s číslem alespoň takovým,
+        jaké má komponenta vrcholu ‹target›
+    """
+    start = condensation.label[source]
+    goal = condensation.label[target]
+    if start == goal:
+        return True
+    if start < goal:
+        return False
+
+    visited = {start}
+    stack = [start]
+    while stack:
+        component = stack.pop()
+        for succ in condensation.dag.succs[component]:
+            if succ == goal:
+                return True
+            if succ > goal and succ not in visited:
+                visited.add(succ)
+                stack.append(succ)
+    return False
+
+
+# Rozšíření: inkrementální udržování komponent
+#
+# IncrementalSCC udržuje silně souvislé komponenty grafu, do něhož se
+# průběžně přidávají hrany. Komponenty jsou uloženy ve struktuře
+# union-find, graf komponent v množinách následníků a předchůdců
+# a komponenty mají topologické pořadí ‹position› (hrana vede vždy
+# z komponenty s menší pozicí do komponenty s větší pozicí).
+# Po přidání hrany, která pořadí porušuje, se podle algoritmu
+# Pearceové a Kellyho prohledá jen úsek pořadí mezi jejími konci:
+# dopředu z cílové komponenty a dozadu ze zdrojové. Pokud se obě
+# prohledávání potkají, hrana uzavřela cyklus a všechny komponenty na
+# cestách z cíle do zdroje se sloučí; zbylé navštívené komponenty se
+# přeřadí tak, aby pořadí opět platilo.
+
+class IncrementalSCC:
+    """Třída IncrementalSCC reprezentuje graf s průběžně udržovanými
+    silně souvislými komponentami.
+
+    Atributy:
+        graph       graf se všemi dosud přidanými hranami
+        parent      otec vrcholu ve struktuře union-find; kořen je
+                    reprezentantem své komponenty
+        members     members[r] jsou vrcholy komponenty s reprezentantem ‹r›
+        out         out[r] jsou reprezentanti komponent, do nichž vede
+                    hrana z komponenty ‹r›
+        into        into[r] jsou reprezentanti komponent, z nichž vede
+                    hrana do komponenty ‹r›
+        position    pozice komponenty s reprezentantem ‹r›
+                    v topologickém pořadí
+        count       počet komponent
+    """
+    __slots__ = 'graph', 'parent', 'members', 'out', 'into', 'position', \
+        'count'
+
+    def __init__(self, size: int):
+        self.graph = Graph(size)
+        self.parent = list(range(size))
+        self.members = [[vertex] for vertex in range(size)]
+        self.out: List[Set[int]] = [set() for _ in range(size)]
+        self.into: List[Set[int]] = [set() for _ in range(size)]
+        self.position = list(range(size))
+        self.count = size
+
+
+def incremental_from_graph(graph: Graph) -> IncrementalSCC:
+    """
+    vstup: ‹graph› – orientovaný graf (objekt typu ‹Graph›)
+    výstup: IncrementalSCC se všemi hranami grafu ‹graph›; komponenty se
+            spočítají najednou Tarjanovým algoritmem
+    časová složitost: O(|V| + |E|)
+    """
+    size = graph.size
+    scc = IncrementalSCC(size)
+    components = strongly_connected_components_iter(graph)
+    count = len(components)
+    scc.count = count
+    for i, component in enumerate(components):
+        root = component[0]
+        # Tarjan dokončuje komponenty v opačném topologickém pořadí
+        scc.position[root] = count - 1 - i
+        for vertex in component:
+            scc.parent[vertex] = root
+            if vertex != root:
+                scc.members[vertex] = []
+        scc.members[root] = component
+
+    parent = scc.parent
+    for vertex in range(size):
+        root = parent[vertex]
+        succs = list(graph.succs[vertex])
+        scc.graph.succs[vertex] = succs
+        for succ in succs:
+            target = parent[succ]
+            if target != root:
+                scc.out[root].add(target)
+                scc.into[target].add(root)
+    return scc
+
+
+def incremental_find(scc: IncrementalSCC, vertex: int) -> int:
+    """
+    vstup: ‹scc› – graf s udržovanými komponentami
+           ‹vertex› – vrchol grafu
+    výstup: reprezentant komponenty vrcholu ‹vertex›
+    """
+    parent = scc.parent
+    root = vertex
+    while parent[root] != root:
+        root = parent[root]
+    while parent[vertex] != root:
+        parent[vertex], vertex = root, parent[vertex]
+    return root
+
+
+def incremental_add_edge(scc: IncrementalSCC, u: int, v: int) -> bool:
+    """
+    vstup: ‹scc› – graf s udržovanými komponentami
+           ‹u›, ‹v› – vrcholy grafu
+    výstup: ‹True›, pokud přidání hrany z ‹u› do ‹v› sloučilo komponenty
+            ‹False› jinak
+    časová složitost: O(1) amortizovaně, pokud hrana neporušuje
+        topologické pořadí; jinak úměrná počtu komponent a hran mezi
+        pozicemi konců hrany
+    """
+    scc.graph.succs[u].append(v)
+    source = incremental_find(scc, u)
+    target = incremental_find(scc, v)
+    if source == target or target in scc.out[source]:
+        return False
+
+    position = scc.position
+    lower = position[target]
+    upper = position[source]
+    if lower > upper:
+        scc.out[source].add(target)
+        scc.into[target].add(source)
+        return False
+
+    forward = incremental_search(scc.out, position, target, upper, True)
+    backward = incremental_search(scc.into, position, source, lower, False)
+    merged = forward & backward
+    # uvolněné pozice; zpětně navštívené komponenty dostanou nejnižší
+    # z nich a dopředně navštívené nejvyšší, takže se žádná z nich
+    # neposune přes komponentu, kterou prohledávání nenavštívilo
+    slots = sorted(position[c] for c in forward | backward)
+    if merged:
+        root = incremental_merge(scc, merged)
+        forward -= merged
+        backward -= merged
+        slots = slots[:len(backward) + 1] \
+            + slots[len(slots) - len(forward):]
+        new_order = sorted(backward, key=position.__getitem__) + [root] \
+            + sorted(forward, key=position.__getitem__)
+    else:
+        scc.out[source].add(target)
+        scc.into[target].add(source)
+        new_order = sorted(backward, key=position.__getitem__) \
+            + sorted(forward, key=position.__getitem__)
+
+    for component, slot in zip(new_order, slots):
+        position[component] = slot
+    return bool(merged)
+
+
+def incremental_search(edges: List[Set[int]], position: List[int],
+                       start: int, bound: int, forward: bool) -> Set[int]:
+    # komponenty dosažitelné ze ‹start› po hranách ‹edges›, které leží
+    # v pořadí nejvýše (dopředu) nebo nejméně (dozadu) na pozici ‹bound›
+    visited = {start}
+    stack = [start]
+    while stack:
+        component = stack.pop()
+        for succ in edges[component]:
+            if succ in visited:
+                continue
+            if position[succ] <= bound if forward \
+                    else position[succ] >= bound:
+                visited.add(succ)
+                stack.append(succ)
+    return visited
+
+
+def incremental_merge(scc: IncrementalSCC, merged: Set[int]) -> int:
+    # sloučí komponenty s reprezentanty ‹merged› do největší z nich
+    root = max(merged, key=lambda c: len(scc.members[c]))
+    out, into = scc.out, scc.into
+    for component in merged:
+        out[root] |= out[component]
+        into[root] |= into[component]
+    out[root] -= merged
+    into[root] -= merged
+
+    for component in merged:
+        if component == root:
+            continue
+        for succ in out[component]:
+            if succ not in merged:
+                into[succ].discard(component)
+                into[succ].add(root)
+        for pred in into[component]:
+            if pred not in merged:
+                out[pred].discard(component)
+                out[pred].add(root)
+        out[component] = set()
+        into[component] = set()
+        scc.parent[component] = root
+        scc.members[root].extend(scc.members[component])
+        scc.members[component] = []
+
+    scc.count -= len(merged) - 1
+    return root
+
+
+def incremental_components(scc: IncrementalSCC) -> List[List[int]]:
+    """
+    vstup: ‹scc› – graf s udržovanými komponentami
+    výstup: seznam všech silně souvislých komponent v topologickém pořadí
+    časová složitost: O(|V| log |V|)
+    """
+    roots = [vertex for vertex in range(scc.graph.size)
+             if scc.parent[vertex] == vertex]
+    roots.sort(key=scc.position.__getitem__)
+    return [list(scc.members[root]) for root in roots]
+
+
+def incremental_terminal(scc: IncrementalSCC) -> List[List[int]]:
+    """
+    vstup: ‹scc› – graf s udržovanými komponentami
+    výstup: terminální silně souvislé komponenty (viz terminal_sccs)
+    časová složitost: O(|V|)
+    """
+    return [list(scc.members[vertex]) for vertex in range(scc.graph.size)
+            if scc.parent[vertex] == vertex and not scc.out[vertex]]
+
+
+def incremental_initial(scc: IncrementalSCC) -> List[List[int]]:
+    """
+    vstup: ‹scc› – graf s udržovanými komponentami
+    výstup: iniciální silně souvislé komponenty (viz initial_sccs)
+    časová složitost: O(|V|)
+    """
+    return [list(scc.members[vertex]) for vertex in range(scc.graph.size)
+            if scc.parent[vertex] == vertex and not scc.into[vertex]]
+
+
+def benchmark_incremental(size: int = 2000, edges: int = 4000,
+                          step: int = 10, seed: int = 0) -> None:
+    """
+    Přidá do prázdného grafu se ‹size› vrcholy ‹edges› náhodných hran
+    a po každých ‹step› hranách zjistí terminální komponenty: jednou
+    pomocí IncrementalSCC, jednou opakovaným voláním terminal_sccs.
+    """
+    import random
+    from time import perf_counter
+
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(size), rng.randrange(size))
+             for _ in range(edges)]
+
+    start = perf_counter()
+    scc = IncrementalSCC(size)
+    for i, (u, v) in enumerate(pairs, 1):
+        incremental_add_edge(scc, u, v)
+        if i % step == 0:
+            incremental_terminal(scc)
+    print(f"IncrementalSCC: {perf_counter() - start:.2f} s, "
+          f"{scc.count} komponent")
+
+    start = perf_counter()
+    graph = Graph(size)
+    for i, (u, v) in enumerate(pairs, 1):
+        graph.succs[u].append(v)
+        if i % step == 0:
+            terminal_sccs(graph)
+    print(f"terminal_sccs po každých {step} hranách: "
+          f"{perf_counter() - start:.2f} s")
+
+
+# Rozšíření: paralelní hledání komponent (FW-BW)
+#
+# scc_parallel hledá komponenty algoritmem forward-backward: z libovolného
+# pivota ‹p› najde množinu FW vrcholů dosažitelných z ‹p› a množinu BW
+# vrcholů, z nichž je ‹p› dosažitelný. Průnik FW a BW je komponenta
+# vrcholu ‹p›, každá další komponenta leží celá v jedné ze tří zbylých
+# částí (FW bez BW, BW bez FW, ostatní vrcholy), které se pak zpracují
+# nezávisle na sobě – to jsou úlohy pro jednotlivé procesy. Před každým
+# rozdělením se odříznou (trimming) vrcholy bez vstupních nebo výstupních
+# hran uvnitř úlohy, protože ty tvoří jednoprvkové komponenty. Malé
+# úlohy se dořeší Tarjanovým algoritmem.
+# Pole grafu v reprezentaci CSR (následníci i předchůdci) se do procesů
+# nekopírují, procesy je čtou ze sdílené paměti.
+
+def csr_transpose(graph: CSRGraph) -> CSRGraph:
+    """
+    vstup: ‹graph› – graf ve formátu CSR
+    výstup: graf s opačně orientovanými hranami ve formátu CSR
+    časová složitost: O(|V| + |E|)
+    """
+    size = graph.size
+    graph_offsets, graph_targets = graph.offsets, graph.targets
+    offsets = array('i', bytes(4 * (size + 1)))
+    for target in graph_targets:
+        offsets[target + 1] += 1
+    for vertex in range(size):
+        offsets[vertex + 1] += offsets[vertex]
+
+    targets = array('i', bytes(4 * len(graph_targets)))
+    position = array('i', offsets[:-1])
+    for vertex in range(size):
+        for j in range(graph_offsets[vertex], graph_offsets[vertex + 1]):
+            target = graph_targets[j]
+            targets[position[target]] = vertex
+            position[target] += 1
+    return CSRGraph(offsets, targets)
+
+
+# pole offsets a targets grafu a transponovaného grafu, se kterými
+# pracuje parallel_fwbw (v pracovních procesech ve sdílené paměti)
+PARALLEL_ARRAYS: List[memoryview] = []
+PARALLEL_MEMORY: list = []
+
+
+def parallel_attach(blocks: List[Tuple[str, int]]) -> None:
+    # inicializace pracovního procesu: připojí sdílenou paměť
+    from multiprocessing.shared_memory import SharedMemory
+
+    memory = [SharedMemory(name=name) for name, _ in blocks]
+    PARALLEL_MEMORY[:] = memory
+    PARALLEL_ARRAYS[:] = [block.buf[:4 * length].cast('i')
+                          for block, (_, length) in zip(memory, blocks)]
+
+
+def parallel_reach(offsets: memoryview, targets: memoryview,
+                   start: int, inside: Set[int]) -> Set[int]:
+    # vrcholy z ‹inside› dosažitelné ze ‹start› uvnitř ‹inside›
+    reached = {start}
+    stack = [start]
+    while stack:
+        vertex = stack.pop()
+        for j in range(offsets[vertex], offsets[vertex + 1]):
+            succ = targets[j]
+            if succ in inside and succ not in reached:
+                reached.add(succ)
+                stack.append(succ)
+    return reached
+
+
+def parallel_fwbw(vertices: List[int], cutoff: int
+                  ) -> Tuple[List[List[int]], List[List[int]]]:
+    """
+    vstup: ‹vertices› – vrcholy úlohy; každá komponenta grafu, která má
+                        s ‹vertices› společný vrchol, v nich leží celá
+           ‹cutoff› – úlohy s nejvýše tolika vrcholy se dořeší najednou
+    výstup: dvojice (nalezené komponenty, podúlohy)
+    časová složitost: O(|V| + |E|) pro podgraf indukovaný ‹vertices›
+    """
+    forward_offsets, forward_targets, backward_offsets, backward_targets \
+        = PARALLEL_ARRAYS
+    inside = set(vertices)
+    found: List[List[int]] = []
+
+    out_degree = {}
+    in_degree = {}
+    for vertex in inside:
+        out_degree[vertex] = sum(
+            1 for j in range(forward_offsets[vertex],
+                             forward_offsets[vertex + 1])
+            if forward_targets[j] in inside)
+        in_degree[vertex] = sum(
+            1 for j in range(backward_offsets[vertex],
+                             backward_offsets[vertex + 1])
+            if backward_targets[j] in inside)
+    trimmed = [vertex for vertex in inside
+               if out_degree[vertex] == 0 or in_degree[vertex] == 0]
+    while trimmed:
+        vertex = trimmed.pop()
+        if vertex not in inside:
+            continue
+        inside.remove(vertex)
+        found.append([vertex])
+        for j in range(forward_offsets[vertex], forward_offsets[vertex + 1]):
+            succ = forward_targets[j]
+            if succ in inside:
+                in_degree[succ] -= 1
+                if in_degree[succ] == 0:
+                    trimmed.append(succ)
+        for j in range(backward_offsets[vertex],
+                       backward_offsets[vertex + 1]):
+            pred = backward_targets[j]
+            if pred in inside:
+                out_degree[pred] -= 1
+                if out_degree[pred] == 0:
+                    trimmed.append(pred)
+
+    if not inside:
+        return found, []
+
+    if len(inside) <= cutoff:
+        local = list(inside)
+        number = {vertex: i for i, vertex in enumerate(local)}
+        subgraph = Graph(len(local))
+        for i, vertex in enumerate(local):
+            subgraph.succs[i] = [
+                number[forward_targets[j]]
+                for j in range(forward_offsets[vertex],
+                               forward_offsets[vertex + 1])
+                if forward_targets[j] in number]
+        for component in strongly_connected_components_iter(subgraph):
+            found.append([local[i] for i in component])
+        return found, []
+
+    pivot = next(iter(inside))
+    forward = parallel_reach(forward_offsets, forward_targets, pivot, inside)
+    backward = parallel_reach(backward_offsets, backward_targets, pivot,
+                              inside)
+    component = forward & backward
+    found.append(list(component))
+    parts = forward - component, backward - component, \
+        inside - forward - backward
+    return found, [list(part) for part in parts if part]
+
+
+def scc_parallel(graph: Graph, processes: int = 4,
+                 cutoff: int = 1 << 14) -> List[List[int]]:
+    """
+    vstup: ‹graph› – orientovaný graf (Graph nebo CSRGraph)
+           ‹processes› – počet pracovních procesů
+           ‹cutoff› – velikost úlohy, kterou proces dořeší sám
+    výstup: seznam všech silně souvislých komponent grafu (tytéž
+            komponenty jako strongly_connected_components, v jiném pořadí)
+    časová složitost: O(|V| · (|V| + |E|)) v nejhorším případě,
+        na běžných grafech O((|V| + |E|) log |V|)
+    """
+    csr = graph if isinstance(graph, CSRGraph) else csr_from_graph(graph)
+    reverse = csr_transpose(csr)
+    arrays = [csr.offsets, csr.targets, reverse.offsets, reverse.targets]
+    result: List[List[int]] = []
+    pending = [list(range(csr.size))] if csr.size > 0 else []
+
+    if processes <= 1:
+        PARALLEL_ARRAYS[:] = [memoryview(a) for a in arrays]
+        try:
+            while pending:
+                found, tasks = parallel_fwbw(pending.pop(), cutoff)
+                result.extend(found)
+                pending.extend(tasks)
+        finally:
+            PARALLEL_ARRAYS.clear()
+        return result
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, \
+        wait
+    from multiprocessing.shared_memory import SharedMemory
+
+    shared = []
+    try:
+        for a in arrays:
+            block = SharedMemory(create=True, size=max(1, 4 * len(a)))
+            block.buf[:4 * len(a)] = memoryview(a).cast('B')
+            shared.append(block)
+        blocks = [(block.name, len(a)) for block, a in zip(shared, arrays)]
+        with ProcessPoolExecutor(processes, initializer=parallel_attach,
+                                 initargs=(blocks,)) as pool:
+            running = {pool.submit(parallel_fwbw, task, cutoff)
+                       for task in pending}
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    found, tasks = future.result()
+                    result.extend(found)
+                    for task in tasks:
+                        running.add(pool.submit(parallel_fwbw, task, cutoff))
+    finally:
+        for block in shared:
+            block.close()
+            block.unlink()
+    return result
+
+
+def benchmark_parallel(size: int = 10 ** 6, edges: int = 2 * 10 ** 6,
+                       seed: int = 0) -> None:
+    """
+    Změří scc_parallel s 1, 2, 4 a 8 procesy na náhodném grafu
+    a porovná výsledek i čas se strongly_connected_components_iter.
+    """
+    from time import perf_counter
+
+    csr = csr_from_graph(random_graph(size, edges, seed))
+    start = perf_counter()
+    expected = sorted(sorted(c) for c in
+                      strongly_connected_components_iter(csr))
+    print(f"strongly_connected_components_iter: "
+          f"{perf_counter() - start:.2f} s")
+    for processes in 1, 2, 4, 8:
+        start = perf_counter()
+        components = scc_parallel(csr, processes)
+        elapsed = perf_counter() - start
+        same = sorted(sorted(c) for c in components) == expected
+        print(f"scc_parallel, počet procesů {processes}: {elapsed:.2f} s, "
+              f"{'shoduje se' if same else 'NESHODUJE SE'}")
+
+
+# Rozšíření: načítání a ukládání grafů
+#
+# load_edge_list načte graf ze seznamu hran v textovém souboru (na každém
+# řádku dvojice čísel vrcholů oddělených mezerou, prázdné řádky a řádky
+# začínající znakem # se přeskakují). Soubor se čte dvakrát: v prvním
+# průchodu se spočítají výstupní stupně vrcholů, ve druhém se následníci
+# zapíší přímo na svá místa do pole CSR. Kromě výsledného grafu tak
+# načítání nepotřebuje žádnou paměť úměrnou počtu hran.
+#
+# save_graph uloží graf v binárním formátu: hlavička GRAPH_HEADER
+# (GRAPH_MAGIC, počet vrcholů, počet hran), za ní pole offsets a targets
+# grafu CSR (čtyřbajtová čísla v pořadí bajtů počítače, jako array.tofile).
+# MappedGraph takový soubor namapuje do paměti; je to CSRGraph, jehož pole
+# jsou pohledy přímo do souboru, takže ho lze předat všem funkcím
+# pro hledání komponent bez načítání.
+
+GRAPH_MAGIC = b"GRAPH\x00\x01\x00"
+GRAPH_HEADER = "<8sQQ"
+
+
+def edge_list_pairs(file: Iterable[str]) -> Iterator[Tuple[int, int]]:
+    for line in file:
+        parts = line.split()
+        if not parts or parts[0].startswith("#"):
+            continue
+        if len(parts) < 2:
+            raise ValueError(f"invalid edge line {line.rstrip()!r}")
+        yield int(parts[0]), int(parts[1])
+
+
+def load_edge_list(filename: str, size: int = -1) -> CSRGraph:
+    """
+    vstup: ‹filename› – textový soubor se seznamem hran
+           ‹size› – počet vrcholů; je-li záporný, určí se podle
+                    největšího čísla vrcholu v souboru
+    výstup: graf ve formátu CSR; následníci každého vrcholu jsou v pořadí,
+            v jakém jsou jeho hrany v souboru
+    časová složitost: O(|V| + |E|)
+    extra prostorová složitost: O(|V|) kromě výsledného grafu
+    """
+    counts = array('i', bytes(4 * max(size, 0)))
+    edges = 0
+    with open(filename) as file:
+        for source, target in edge_list_pairs(file):
+            top = max(source, target)
+            if min(source, target) < 0 or 0 <= size <= top:
+                raise ValueError(f"invalid edge {source} {target}")
+            if top >= len(counts):
+                counts.frombytes(bytes(4 * (top + 1 - len(counts))))
+            counts[source] += 1
+            edges += 1
+
+    offsets = array('i', [0])
+    for count in counts:
+        offsets.append(offsets[-1] + count)
+    targets = array('i', bytes(4 * edges))
+    position = counts
+    position[:] = offsets[:-1]
+    with open(filename) as file:
+        for source, target in edge_list_pairs(file):
+            targets[position[source]] = target
+            position[source] += 1
+    return CSRGraph(offsets, targets)
+
+
+def save_graph(graph: Graph, filename: str) -> int:
+    """
+    vstup: ‹graph› – orientovaný graf (Graph nebo CSRGraph)
+           ‹filename› – jméno výstupního souboru
+    výstup: počet zapsaných hran
+    časová složitost: O(|V| + |E|)
+    """
+    from struct import pack
+
+    if isinstance(graph, CSRGraph):
+        with open(filename, "wb") as file:
+            file.write(pack(GRAPH_HEADER, GRAPH_MAGIC, graph.size,
+                            len(graph.targets)))
+            file.write(memoryview(graph.offsets).cast('B'))
+            file.write(memoryview(graph.targets).cast('B'))
+        return len(graph.targets)
+
+    offsets = array('i', [0])
+    for vertex in range(graph.size):
+        offsets.append(offsets[-1] + len(graph.succs[vertex]))
+    with open(filename, "wb") as file:
+        file.write(pack(GRAPH_HEADER, GRAPH_MAGIC, graph.size, offsets[-1]))
+        offsets.tofile(file)
+        # následníky zapisuji po vrcholech, celé pole targets nevzniká
+        for vertex in range(graph.size):
+            array('i', graph.succs[vertex]).tofile(file)
+    return offsets[-1]
+
+
+def read_graph_header(data: bytes) -> Tuple[int, int]:
+    from struct import calcsize, unpack_from
+
+    if len(data) < calcsize(GRAPH_HEADER):
+        raise ValueError("not a graph file")
+    magic, size, edges = unpack_from(GRAPH_HEADER, data)
+    if magic != GRAPH_MAGIC or \
+            len(data) < calcsize(GRAPH_HEADER) + 4 * (size + 1 + edges):
+        raise ValueError("not a graph file")
+    return size, edges
+
+
+def load_graph(filename: str) -> CSRGraph:
+    """
+    vstup: ‹filename› – soubor zapsaný pomocí save_graph
+    výstup: uložený graf ve formátu CSR (načtený do paměti)
+    časová složitost: O(|V| + |E|)
+    """
+    from struct import calcsize
+
+    with open(filename, "rb") as file:
+        data = file.read()
+    size, edges = read_graph_header(data)
+    start = calcsize(GRAPH_HEADER)
+    offsets = array('i', data[start:start + 4 * (size + 1)])
+    start += 4 * (size + 1)
+    targets = array('i', data[start:start + 4 * edges])
+    return CSRGraph(offsets, targets)
+
+
+class MappedGraph(CSRGraph):
+    """Třída MappedGraph reprezentuje graf uložený pomocí save_graph
+    v souboru namapovaném do paměti (pouze pro čtení).
+
+    Atributy (navíc oproti CSRGraph):
+        file    otevřený soubor
+        data    namapovaný obsah souboru
+        view    pohled na celý namapovaný obsah
+    """
+    __slots__ = 'file', 'data', 'view'
+
+    def __init__(self, filename: str):
+        import mmap
+        from struct import calcsize
+
+        self.file = open(filename, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        size, edges = read_graph_header(self.data)
+        self.view = memoryview(self.data)
+        start = calcsize(GRAPH_HEADER)
+        middle = start + 4 * (size + 1)
+        super().__init__(
+            self.view[start:middle].cast('i'),  # type: ignore
+            self.view[middle:middle + 4 * edges].cast('i'))  # type: ignore
+
+    def close(self) -> None:
+        # pohledy do souboru (např. succs[v]) musí být před zavřením uvolněny
+        self.succs.targets.release()  # type: ignore
+        self.offsets.release()  # type: ignore
+        self.targets.release()  # type: ignore
+        self.view.release()
+        self.data.close()
+        self.file.close()
+
+
+def benchmark_loading(size: int = 10 ** 5, edges: int = 10 ** 6,
+                      filename: str = "ib002_graph.txt",
+                      seed: int = 0) -> None:
+    """
+    Zapíše náhodný graf jako seznam hran a porovná čas a paměť jeho
+    načtení do Graph, pomocí load_edge_list, load_graph a MappedGraph.
+    """
+    import os
+    import tracemalloc
+    from time import perf_counter
+
+    graph = random_graph(size, edges, seed)
+    with open(filename, "w") as file:
+        for vertex in range(size):
+            for succ in graph.succs[vertex]:
+                file.write(f"{vertex} {succ}\n")
+    binary = filename + ".bin"
+    save_graph(graph, binary)
+    del graph
+
+    def naive() -> Graph:
+        with open(filename) as file:
+            pairs = list(edge_list_pairs(file))
+        result = Graph(size)
+        for source, target in pairs:
+            result.succs[source].append(target)
+        return result
+
+    for name, fun in (("seznam dvojic + Graph", naive),
+                      ("load_edge_list", lambda: load_edge_list(filename)),
+                      ("load_graph", lambda: load_graph(binary)),
+                      ("MappedGraph", lambda: MappedGraph(binary))):
+        # čas a paměť měřím zvlášť, tracemalloc alokace výrazně zpomaluje
+        start = perf_counter()
+        loaded = fun()
+        elapsed = perf_counter() - start
+        if isinstance(loaded, MappedGraph):
+            loaded.close()
+        del loaded
+        tracemalloc.start()
+        loaded = fun()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if isinstance(loaded, MappedGraph):
+            loaded.close()
+        del loaded
+        print(f"{name}: {elapsed:.2f} s, špička {peak / 2 ** 20:.1f} MiB")
+    os.remove(filename)
+    os.remove(binary)
+
+
+# Rozšíření: vektorové výpočty nad grafem CSR
+#
+# in_degrees, out_degree a číslování komponent v shrink procházejí
+# seznamy následníků v Pythonu po jednotlivých hranách. Následující funkce
+# počítají stupně vrcholů, čísla komponent a masku hran mezi komponentami
+# nad poli grafu CSR najednou pomocí knihovny NumPy (bincount, repeat,
+# indexování polem). Knihovna NumPy je volitelná: pokud není nainstalovaná
+# (nebo je ‹use_numpy› False), použije se stejný výpočet nad poli array.
+# Výsledkem jsou v prvním případě pole numpy.ndarray, ve druhém array('i')
+# a bytearray; obojí se indexuje stejně.
+
+def load_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def numpy_view(np: Any, data: Any) -> Any:
+    # pole typu int32 nad polem grafu bez kopírování
+    if len(data) == 0:
+        return np.zeros(0, dtype=np.intc)
+    return np.frombuffer(data, dtype=np.intc)
+
+
+def csr_degrees(graph: CSRGraph, use_numpy: bool = True) -> Tuple[Any, Any]:
+    """
+    vstup: ‹graph› – graf ve formátu CSR
+    výstup: dvojice (výstupní stupně, vstupní stupně) všech vrcholů
+    časová složitost: O(|V| + |E|)
+    """
+    np = load_numpy() if use_numpy else None
+    if np is not None:
+        offsets = numpy_view(np, graph.offsets)
+        targets = numpy_view(np, graph.targets)
+        return np.diff(offsets), \
+            np.bincount(targets, minlength=graph.size)
+
+    offsets = graph.offsets
+    out_degrees = array('i', (offsets[vertex + 1] - offsets[vertex]
+                              for vertex in range(graph.size)))
+    in_degrees = array('i', bytes(4 * graph.size))
+    for target in graph.targets:
+        in_degrees[target] += 1
+    return out_degrees, in_degrees
+
+
+def csr_component_labels(size: int, components: List[List[int]],
+                         use_numpy: bool = True) -> Any:
+    """
+    vstup: ‹size› – počet vrcholů grafu
+           ‹components› – silně souvislé komponenty grafu
+    výstup: pole, které vrcholu přiřazuje číslo jeho komponenty
+    časová složitost: O(|V|)
+    """
+    np = load_numpy() if use_numpy else None
+    if np is not None:
+        lengths = np.fromiter((len(c) for c in components), dtype=np.intp,
+                              count=len(components))
+        vertices = np.fromiter((v for c in components for v in c),
+                               dtype=np.intp, count=size)
+        labels = np.empty(size, dtype=np.intc)
+        labels[vertices] = np.repeat(
+            np.arange(len(components), dtype=np.intc), lengths)
+        return labels
+
+    labels = array('i', bytes(4 * size))
+    for i, component in enumerate(components):
+        for vertex in component:
+            labels[vertex] = i
+    return labels
+
+
+def csr_cross_mask(graph: CSRGraph, labels: Any,
+                   use_numpy: bool = True) -> Any:
+    """
+    vstup: ‹graph› – graf ve formátu CSR
+           ‹labels› – čísla komponent vrcholů (viz csr_component_labels)
+    výstup: maska hran v pořadí pole ‹targets›: prvek je nenulový právě
+            tehdy, když hrana vede mezi dvěma různými komponentami
+    časová složitost: O(|V| + |E|)
+    """
+    np = load_numpy() if use_numpy else None
+    if np is not None:
+        offsets = numpy_view(np, graph.offsets)
+        targets = numpy_view(np, graph.targets)
+        sources = np.repeat(np.arange(graph.size, dtype=np.intc),
+                            np.diff(offsets))
+        labels = np.asarray(labels)
+        return labels[sources] != labels[targets]
+
+    offsets, targets = graph.offsets, graph.targets
+    mask = bytearray(len(targets))
+    for vertex in range(graph.size):
+        own = labels[vertex]
+        for j in range(offsets[vertex], offsets[vertex + 1]):
+            if labels[targets[j]] != own:
+                mask[j] = 1
+    return mask
+
+
+def csr_boundary(graph: CSRGraph, components: List[List[int]],
+                 use_numpy: bool = True) -> Tuple[Any, Any]:
+    """
+    vstup: ‹graph› – graf ve formátu CSR
+           ‹components› – silně souvislé komponenty grafu
+    výstup: dvojice polí (počty hran vedoucích z komponenty do jiných
+            komponent, počty hran vedoucích do komponenty z jiných
+            komponent) indexovaných čísly komponent
+    časová složitost: O(|V| + |E|)
+    """
+    count = len(components)
+    labels = csr_component_labels(graph.size, components, use_numpy)
+    mask = csr_cross_mask(graph, labels, use_numpy)
+    np = load_numpy() if use_numpy else None
+    if np is not None:
+        offsets = numpy_view(np, graph.offsets)
+        targets = numpy_view(np, graph.targets)
+        sources = np.repeat(np.arange(graph.size, dtype=np.intc),
+                            np.diff(offsets))
+        return np.bincount(labels[sources[mask]], minlength=count), \
+            np.bincount(labels[targets[mask]], minlength=count)
+
+    offsets, targets = graph.offsets, graph.targets
+    leaving = array('i', bytes(4 * count))
+    entering = array('i', bytes(4 * count))
+    for vertex in range(graph.size):
+        for j in range(offsets[vertex], offsets[vertex + 1]):
+            if mask[j]:
+                leaving[labels[vertex]] += 1
+                entering[labels[targets[j]]] += 1
+    return leaving, entering
+
+
+def csr_terminal_sccs(graph: CSRGraph,
+                      use_numpy: bool = True) -> List[List[int]]:
+    """
+    vstup: ‹graph› – graf ve formátu CSR
+    výstup: terminální silně souvislé komponenty (viz terminal_sccs)
+    časová složitost: O(|V| + |E|)
+    """
+    components = strongly_connected_components_iter(graph)
+    leaving, _ = csr_boundary(graph, components, use_numpy)
+    return [component for component, count in zip(components, leaving)
+            if count == 0]
+
+
+def csr_initial_sccs(graph: CSRGraph,
+                     use_numpy: bool = True) -> List[List[int]]:
+    """
+    vstup: ‹graph› – graf ve formátu CSR
+    výstup: iniciální silně souvislé komponenty (viz initial_sccs)
+    časová složitost: O(|V| + |E|)
+    """
+    components = strongly_connected_components_iter(graph)
+    _, entering = csr_boundary(graph, components, use_numpy)
+    return [component for component, count in zip(components, entering)
+            if count == 0]
+
+
+def benchmark_kernels(size: int = 10 ** 5, edges: int = 10 ** 6,
+                      seed: int = 0) -> None:
+    """
+    Porovná in_degrees a shrink s csr_degrees a csr_boundary (s NumPy,
+    je-li k dispozici, a bez ní) na náhodném grafu; komponenty se počítají
+    předem, aby se měřily jen samotné průchody hranami.
+    """
+    from time import perf_counter
+
+    graph = random_graph(size, edges, seed)
+    csr = csr_from_graph(graph)
+    components = strongly_connected_components_iter(csr)
+    variants = [("in_degrees", lambda: in_degrees(graph)),
+                ("shrink", lambda: shrink(graph, components)),
+                ("csr_degrees (array)", lambda: csr_degrees(csr, False)),
+                ("csr_boundary (array)",
+                 lambda: csr_boundary(csr, components, False))]
+    if load_numpy() is not None:
+        variants += [("csr_degrees (NumPy)", lambda: csr_degrees(csr)),
+                     ("csr_boundary (NumPy)",
+                      lambda: csr_boundary(csr, components))]
+    else:
+        print("NumPy není nainstalováno")
+    for name, fun in variants:
+        start = perf_counter()
+        fun()
+        print(f"{name}: {perf_counter() - start:.2f} s")
+
+
+# Rozšíření: index dosažitelnosti nad grafem komponent
+#
+# ReachabilityIndex odpovídá na dotazy „je ‹v› dosažitelný z ‹u›?“ nad
+# grafem komponent (Condensation). Index přiřazuje komponentám intervalové
+# značky podle GRAIL: při každém z několika průchodů do hloubky
+# v náhodném pořadí dostane komponenta ‹c› interval [low, post], kde post
+# je pořadí dokončení ‹c› a low nejmenší pořadí dokončení komponenty
+# dosažitelné z ‹c›. Je-li ‹d› dosažitelná z ‹c›, je interval ‹d› obsažen
+# v intervalu ‹c›; pokud tedy obsažen není v některém průchodu, ‹d› jistě
+# dosažitelná není. Kladné odpovědi dává interval stromu prvního průchodu
+# (potomci v DFS stromu jsou dosažitelní). Jen když nerozhodne ani jedno,
+# následuje prohledávání do hloubky, které značky také prořezávají.
+
+class ReachabilityIndex:
+    """Třída ReachabilityIndex reprezentuje index dosažitelnosti.
+
+    Atributy:
+        condensation  graf komponent, nad nímž je index postaven
+        low, post     seznamy polí; low[i][c] a post[i][c] jsou meze
+                      intervalu komponenty ‹c› v ‹i›-tém průchodu
+        first, last   komponenty s číslem pořadí v prvním průchodu
+                      v rozsahu first[c] až last[c] jsou potomky ‹c›
+                      ve stromu prohledávání
+        searches      počet dotazů, na které index nestačil a bylo třeba
+                      prohledávat graf komponent
+    """
+    __slots__ = 'condensation', 'low', 'post', 'first', 'last', 'searches'
+
+    def __init__(self, condensation: Condensation):
+        self.condensation = condensation
+        self.low: List[array] = []
+        self.post: List[array] = []
+        self.first = array('i')
+        self.last = array('i')
+        self.searches = 0
+
+
+def reachability_index(condensation: Condensation, traversals: int = 3,
+                       seed: int = 0) -> ReachabilityIndex:
+    """
+    vstup: ‹condensation› – graf komponent
+           ‹traversals› – počet průchodů (intervalových značek komponenty)
+           ‹seed› – semínko náhodného pořadí průchodů
+    výstup: index dosažitelnosti
+    časová složitost: O(traversals · (|V'| + |E'|)) pro graf komponent
+    """
+    import random
+
+    rng = random.Random(seed)
+    index = ReachabilityIndex(condensation)
+    succs = condensation.dag.succs
+    count = len(condensation.components)
+    roots = [c for c in range(count) if condensation.in_degree[c] == 0]
+
+    for traversal in range(max(traversals, 1)):
+        low = array('i', [count] * count)
+        post = array('i', bytes(4 * count))
+        first = array('i', bytes(4 * count))
+        last = array('i', bytes(4 * count))
+        visited = bytearray(count)
+        rng.shuffle(roots)
+        finished = 0
+        discovered = 0
+        for root in roots:
+            visited[root] = 1
+            first[root] = discovered
+            discovered += 1
+            # zásobník volání: komponenta a její zamíchaní následníci
+            call = [root]
+            pending = [rng.sample(succs[root], len(succs[root]))]
+            while call:
+                component = call[-1]
+                children = pending[-1]
+                while children:
+                    child = children[-1]
+                    if not visited[child]:
+                        break
+                    children.pop()
+                    if low[child] < low[component]:
+                        low[component] = low[child]
+                else:
+                    call.pop()
+                    pending.pop()
+                    post[component] = finished
+                    if finished < low[component]:
+                        low[component] = finished
+                    finished += 1
+                    last[component] = discovered - 1
+                    continue
+                # ‹child› zůstává v seznamu, po jeho dokončení se výše
+                # odebere a jeho low se promítne do ‹component›
+                visited[child] = 1
+                first[child] = discovered
+                discovered += 1
+                call.append(child)
+                pending.append(rng.sample(succs[child], len(succs[child])))
+        index.low.append(low)
+        index.post.append(post)
+        if traversal == 0:
+            index.first, index.last = first, last
+    return index
+
+
+def index_size(index: ReachabilityIndex) -> int:
+    """
+    vstup: ‹index› – index dosažitelnosti
+    výstup: velikost značek indexu v bajtech (bez grafu komponent)
+    """
+    arrays = index.low + index.post + [index.first, index.last]
+    return sum(a.itemsize * len(a) for a in arrays)
+
+
+def index_may_reach(index: ReachabilityIndex, source: int,
+                    target: int) -> bool:
+    # False, pokud značky vylučují cestu z komponenty ‹source› do ‹target›
+    for low, post in zip(index.low, index.post):
+        if low[target] < low[source] or post[target] > post[source]:
+            return False
+    return True
+
+
+def index_reachable(index: ReachabilityIndex, source: int,
+                    target: int) -> bool:
+    """
+    vstup: ‹index› – index dosažitelnosti
+           ‹source›, ‹target› – vrcholy původního grafu
+    výstup: ‹True›, pokud je ‹target› dosažitelný z ‹source›
+    časová složitost: O(počet průchodů), pokud rozhodnou značky;
+        jinak nejvýše O(|V'| + |E'|) pro graf komponent
+    """
+    condensation = index.condensation
+    start = condensation.label[source]
+    goal = condensation.label[target]
+    if start == goal:
+        return True
+    if start < goal or not index_may_reach(index, start, goal):
+        return False
+    first, last = index.first, index.last
+    if first[start] <= first[goal] <= last[start]:
+        return True
+
+    index.searches += 1
+    visited = {start}
+    stack = [start]
+    while stack:
+        component = stack.pop()
+        for succ in condensation.dag.succs[component]:
+            if succ == goal:
+                return True
+            if succ in visited or succ < goal or \
+                    not index_may_reach(index, succ, goal):
+                continue
+            if first[succ] <= first[goal] <= last[succ]:
+                return True
+            visited.add(succ)
+            stack.append(succ)
+    return False
+
+
+def benchmark_reachability(size: int = 10 ** 5, edges: int = 10 ** 5,
+                           queries: int = 10 ** 5, seed: int = 0) -> None:
+    """
+    Postaví index dosažitelnosti pro náhodný graf a vypíše dobu stavby,
+    velikost indexu a propustnost dotazů na náhodné dvojice vrcholů
+    ve srovnání s condensation_reachable (na části dotazů).
+    """
+    import random
+    from time import perf_counter
+
+    # jiné semínko než pro graf, jinak by dotazy byly přesně jeho hrany
+    rng = random.Random(seed + 1)
+    condensation = condense(random_graph(size, edges, seed))
+    start = perf_counter()
+    index = reachability_index(condensation, seed=seed)
+    print(f"stavba indexu: {perf_counter() - start:.2f} s, "
+          f"{len(condensation.components)} komponent, "
+          f"{index_size(index) / 2 ** 20:.1f} MiB")
+
+    pairs = [(rng.randrange(size), rng.randrange(size))
+             for _ in range(queries)]
+    start = perf_counter()
+    answers = [index_reachable(index, u, v) for u, v in pairs]
+    elapsed = perf_counter() - start
+    print(f"index_reachable: {queries / elapsed:.0f} dotazů/s, "
+          f"prohledávání u {index.searches} z {queries} dotazů, "
+          f"{sum(answers)} kladných")
+
+    sample = pairs[:max(queries // 100, 1)]
+    start = perf_counter()
+    expected = [condensation_reachable(condensation, u, v)
+                for u, v in sample]
+    elapsed = perf_counter() - start
+    same = expected == answers[:len(sample)]
+    print(f"condensation_reachable: {len(sample) / elapsed:.0f} dotazů/s, "
+          f"{'shoduje se' if same else 'NESHODUJE SE'}")
+
+
 # Následující funkci můžete použít pro vykreslení grafu při vlastním
 # testování.
 